@@ -1,40 +1,247 @@
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Any, Dict
-
-from flask import Flask, jsonify, render_template, request
-
+import hmac
+import io
+import json
+import math
+import os
+import time
+import uuid
+import weakref
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from flask import Flask, Response, g, jsonify, render_template, request, url_for
+
+from brainstorm.assets import IMMUTABLE_CACHE_CONTROL, build_manifest
+from brainstorm.compression import COMPRESSORS, MIN_COMPRESSED_SIZE, compress
 from brainstorm.domain import (
     Board,
+    Command,
+    DeleteNote,
+    Event,
     ForbiddenInPhase,
     InvalidPhaseTransition,
     NameAlreadyExists,
     NoteTextTooLong,
     NotAuthor,
+    Note,
+    NoteDraft,
     NotFound,
     NotOrganizer,
+    MoveNote,
+    Participant,
     Phase,
+    SetVote,
     StickyLimitExceeded,
+    Viewport,
     VoteLimitExceeded,
 )
+from brainstorm.metrics import Metrics
+from brainstorm.persistence import open_board, persist
+from brainstorm.ratelimit import InFlightLimit, RateLimiter
+from brainstorm.registry import BoardRegistry, TooManyBoards
+from brainstorm.replication import (
+    OwnerUnavailable,
+    ReplicaRegistry,
+    forward,
+    replication_path,
+    wait_for_version,
+)
+from brainstorm.serialization import (
+    BoardStateCache,
+    export_lines,
+    note_to_dict,
+    participant_to_dict,
+)
+from brainstorm.workload import record
+
+LONG_POLL_TIMEOUT = 25.0
+STREAM_HEARTBEAT = 15.0
+# Live drag positions are coalesced per note and pushed at most this often (20 Hz).
+DRAG_TICK = 0.05
+# When set, every board is journaled to a subdirectory and restored on startup.
+DATA_DIR = os.environ.get("BRAINSTORM_DATA_DIR")
+DEFAULT_BOARD_DIR = "default"
+# When set, this is one of several worker processes: reads are served from
+# replicas of the boards held by the owner process (owner.py) on this Unix
+# socket, and writes are forwarded to it.
+OWNER_SOCKET = os.environ.get("BRAINSTORM_OWNER_SOCKET")
+# Response headers that belong to the owner's connection, not to the reply.
+HOP_HEADERS = {"connection", "content-length", "date", "server", "transfer-encoding"}
+# Boards one process holds at most; POST /api/boards answers 503 past it.
+# Each board may own a journal and a recorder thread, and none is evicted.
+MAX_BOARDS = int(os.environ.get("BRAINSTORM_MAX_BOARDS", "200"))
+# When set, /metrics requires "Authorization: Bearer <token>" instead of an access code.
+METRICS_TOKEN = os.environ.get("BRAINSTORM_METRICS_TOKEN")
+# When set, every board in this process is recorded to this directory for
+# replay with benchmarks.replay (see brainstorm.workload).
+RECORD_DIR = os.environ.get("BRAINSTORM_RECORD_DIR")
+# Token buckets: each participant's writes, and all requests to one board.
+# A drag streams 20 positions per second, so a participant gets headroom above that.
+PARTICIPANT_RATE, PARTICIPANT_BURST = 25.0, 50.0
+BOARD_RATE, BOARD_BURST = 500.0, 1000.0
+# Requests handled at once (long-polls and streams excluded) before shedding with 503.
+MAX_IN_FLIGHT = 32
+BUSY_RETRY_AFTER = 1
 
 app = Flask(__name__)
-board: Board = Board()
+assets = build_manifest(app.static_folder)
+participant_limiter = RateLimiter(PARTICIPANT_RATE, PARTICIPANT_BURST)
+board_limiter = RateLimiter(BOARD_RATE, BOARD_BURST)
+in_flight = InFlightLimit(MAX_IN_FLIGHT)
+metrics = Metrics()
+Board.operation_observer = metrics.observe_operation
+registry: Union[BoardRegistry, ReplicaRegistry] = (
+    BoardRegistry(MAX_BOARDS) if OWNER_SOCKET is None else ReplicaRegistry(replication_path(OWNER_SOCKET))
+)
+
+
+def _restore_boards(data_dir: str) -> Board:
+    """Register every board persisted under ``data_dir``; return the default one."""
+    os.makedirs(data_dir, exist_ok=True)
+    for name in sorted(os.listdir(data_dir)):
+        if name != DEFAULT_BOARD_DIR and os.path.isdir(os.path.join(data_dir, name)):
+            registry.add(open_board(os.path.join(data_dir, name)))
+    return registry.add(open_board(os.path.join(data_dir, DEFAULT_BOARD_DIR)))
+
+
+def _initial_board() -> Board:
+    if isinstance(registry, ReplicaRegistry):
+        return registry.default()
+    if DATA_DIR is not None:
+        return _restore_boards(DATA_DIR)
+    return registry.add(Board())
+
+
+def _record_workload(recorded: Board) -> None:
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    name = f"{recorded.access_code}-{int(time.time())}.jsonl.gz"
+    record(recorded, os.path.join(RECORD_DIR, name))
+
+
+# The default board is the one advertised on the start page.
+board: Board = _initial_board()
+if RECORD_DIR is not None and OWNER_SOCKET is None:
+    # Workers only hold replicas; the owner process records the boards.
+    for _recorded_board in registry.boards():
+        _record_workload(_recorded_board)
+_state_caches: "weakref.WeakKeyDictionary[Board, BoardStateCache]" = weakref.WeakKeyDictionary()
 
 
 def set_board(new_board: Board) -> None:
-    global board
-    board = new_board
+    global board, registry
+    registry = BoardRegistry(MAX_BOARDS)
+    board = registry.add(new_board)
+
+
+# Plain helpers behind the request hooks. asgi.py serves long-polls and
+# streams without Flask and calls them directly, so both entry points resolve,
+# limit, measure and label those requests the same way.
+
+
+def resolve_board(code: Optional[str]) -> Optional[Board]:
+    """The board ``code`` opens, or None."""
+    return registry.get(code) if code else None
+
+
+def rate_limit_wait(current: Board, method: str, name: Optional[Any]) -> float:
+    """Take tokens for a request to ``current``: 0.0 if it may run, else seconds to wait.
+
+    Every request draws from the board's bucket; writes by a participant on
+    the board also draw from that participant's.
+    """
+    code = current.access_code
+    wait = board_limiter.acquire(code)
+    if not wait and method != "GET" and isinstance(name, str) and name in current.participants:
+        wait = participant_limiter.acquire((code, name))
+    return wait
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def board_version_header(current: Board) -> Tuple[str, str]:
+    return "X-Board-Version", str(current.version)
+
+
+def observe_request(
+    route: str, method: str, status: int, started: float, size: Optional[int]
+) -> None:
+    metrics.observe_request(route, method, status, time.perf_counter() - started, size)
 
 
 def _require_access_code() -> Any:
-    code = request.headers.get("X-Access-Code") or request.args.get("access_code")
-    if code != board.access_code:
+    current = resolve_board(_request_access_code())
+    if current is None:
         return jsonify({"error": "invalid access code"}), 401
+    g.board = current
     return None
 
 
+def _request_access_code() -> Optional[str]:
+    return request.headers.get("X-Access-Code") or request.args.get("access_code")
+
+
+@app.before_request
+def start_request_timer() -> None:
+    request.environ["brainstorm.started"] = time.perf_counter()
+
+
+def _is_long_lived() -> bool:
+    if request.path == "/api/board/stream":
+        return True
+    return request.path == "/api/board/changes" and request.args.get("wait", 0.0, type=float) > 0
+
+
+def _retry_later(message: str, status: int, seconds: float) -> Response:
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers["Retry-After"] = retry_after(seconds)
+    return response
+
+
+@app.before_request
+def shed_load() -> Any:
+    # Runs before any forwarding, parsing or board work, so refusing is cheap.
+    if not _is_long_lived():
+        if not in_flight.enter():
+            return _retry_later("server busy", 503, BUSY_RETRY_AFTER)
+        request.environ["brainstorm.in_flight"] = True
+    return None
+
+
+@app.teardown_request
+def leave_in_flight(_: Optional[BaseException]) -> None:
+    if request.environ.pop("brainstorm.in_flight", False):
+        in_flight.leave()
+
+
+@app.before_request
+def forward_writes_to_owner() -> Any:
+    if OWNER_SOCKET is None or request.method == "GET" or not request.path.startswith("/api/"):
+        return None
+    headers = {
+        name: value
+        for name, value in request.headers.items()
+        if name in ("Content-Type", "X-Access-Code")
+    }
+    status, owner_headers, body = forward(
+        OWNER_SOCKET, request.method, request.full_path, headers, request.get_data()
+    )
+    # Let the client read its own write from this worker's replica.
+    version = dict(owner_headers).get("X-Board-Version")
+    code = _request_access_code()
+    replica = registry.get(code) if code else None
+    if replica is not None and version is not None:
+        wait_for_version(replica, int(version))
+    return app.response_class(
+        body,
+        status=status,
+        headers=[(name, value) for name, value in owner_headers if name.lower() not in HOP_HEADERS],
+    )
+
+
 @app.before_request
 def check_access_code() -> Any:
     if request.path.startswith("/api/"):
@@ -42,6 +249,94 @@ def check_access_code() -> Any:
     return None
 
 
+@app.before_request
+def limit_rates() -> Any:
+    # After check_access_code: buckets belong to boards and their participants,
+    # so made-up access codes and names cannot grow the limiter tables.
+    current = g.get("board")
+    if current is None:
+        return None
+    name = None
+    if request.method != "GET":
+        name = request.args.get("name")
+        if name is None and request.is_json:
+            payload = request.get_json(silent=True)
+            name = payload.get("name") if isinstance(payload, dict) else None
+    wait = rate_limit_wait(current, request.method, name)
+    if wait:
+        return _retry_later("too many requests", 429, wait)
+    return None
+
+
+@app.after_request
+def add_board_version(response: Response) -> Response:
+    current = g.get("board")
+    if current is not None:
+        name, value = board_version_header(current)
+        response.headers[name] = value
+    return response
+
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    # Streamed responses are timed to their first byte and have no size.
+    # The request proxy is resolved once: each proxy lookup costs a few
+    # hundred nanoseconds, which adds up to most of this hook.
+    current = request._get_current_object()  # type: ignore[attr-defined]
+    rule = current.url_rule
+    observe_request(
+        rule.rule if rule is not None else "<unmatched>",
+        current.method,
+        response.status_code,
+        current.environ["brainstorm.started"],
+        None if response.is_streamed else len(response.get_data()),
+    )
+    return response
+
+
+def _negotiate_encoding(available: Iterable[str] = COMPRESSORS) -> Optional[str]:
+    """The preferred encoding the client accepts, or None to send the body as is."""
+    return request.accept_encodings.best_match(available)
+
+
+def _encoded_etag(etag: str, content_encoding: Optional[str]) -> str:
+    # A strong validator names one representation: each encoding gets its own.
+    return etag if content_encoding is None else f"{etag}-{content_encoding}"
+
+
+def _not_modified(etag: str) -> Optional[Response]:
+    """A 304 if the client holds ``etag``, as is or in the encoding it would get."""
+    for candidate in (etag, _encoded_etag(etag, _negotiate_encoding())):
+        if request.if_none_match.contains(candidate):
+            not_modified = app.response_class(status=304)
+            not_modified.set_etag(candidate)
+            not_modified.vary.add("Accept-Encoding")
+            return not_modified
+    return None
+
+
+@app.after_request
+def compress_json_response(response: Response) -> Response:
+    # Registered after record_request_metrics so it runs first: the metrics
+    # see the size actually sent. /api/board compresses through its cache.
+    if (
+        response.mimetype != "application/json"
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate_encoding()
+    body = response.get_data()
+    if encoding is not None and len(body) >= MIN_COMPRESSED_SIZE:
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag is not None:
+            response.set_etag(_encoded_etag(etag, encoding), weak)
+    return response
+
+
 def _bad_request(message: str):
     return jsonify({"error": message}), 400
 
@@ -63,7 +358,7 @@ def handle_invalid_phase(_: InvalidPhaseTransition):
 
 @app.errorhandler(ForbiddenInPhase)
 def handle_forbidden_phase(_: ForbiddenInPhase):
-    return jsonify({"error": f"action forbidden in {board.phase.value} phase"}), 403
+    return jsonify({"error": f"action forbidden in {g.board.phase.value} phase"}), 403
 
 
 @app.errorhandler(VoteLimitExceeded)
@@ -71,14 +366,18 @@ def handle_vote_limit(_: VoteLimitExceeded):
     return _bad_request("vote limit exceeded")
 
 
+NOTE_TEXT_TOO_LONG = "sticky text exceeds 200 characters"
+STICKY_LIMIT_REACHED = "sticky limit reached (50 per participant)"
+
+
 @app.errorhandler(NoteTextTooLong)
 def handle_note_text_too_long(_: NoteTextTooLong):
-    return _bad_request("sticky text exceeds 200 characters")
+    return _bad_request(NOTE_TEXT_TOO_LONG)
 
 
 @app.errorhandler(StickyLimitExceeded)
 def handle_sticky_limit(_: StickyLimitExceeded):
-    return _bad_request("sticky limit reached (50 per participant)")
+    return _bad_request(STICKY_LIMIT_REACHED)
 
 
 @app.errorhandler(NotAuthor)
@@ -91,6 +390,16 @@ def handle_not_found(_: NotFound):
     return jsonify({"error": "not found"}), 404
 
 
+@app.errorhandler(TooManyBoards)
+def handle_too_many_boards(_: TooManyBoards):
+    return jsonify({"error": "board limit reached"}), 503
+
+
+@app.errorhandler(OwnerUnavailable)
+def handle_owner_unavailable(_: OwnerUnavailable):
+    return _retry_later("board owner unavailable", 503, BUSY_RETRY_AFTER)
+
+
 @app.route("/")
 def index():
     return render_template("index.html", access_code=board.access_code)
@@ -98,17 +407,72 @@ def index():
 
 @app.route("/board")
 def board_view():
-    return render_template("board.html", access_code=board.access_code)
+    current = registry.get(request.args.get("access_code", "")) or board
+    return render_template("board.html", access_code=current.access_code)
+
+
+@app.template_global()
+def asset_url(source_name: str) -> str:
+    """URL of a static file, fingerprinted when it was in the static folder at startup."""
+    name = assets.fingerprinted(source_name)
+    if name is None:
+        return url_for("static", filename=source_name)
+    return url_for("asset", name=name)
+
+
+@app.route("/assets/<name>")
+def asset(name: str):
+    found = assets.get(name)
+    if found is None:
+        return jsonify({"error": "not found"}), 404
+    encoding = _negotiate_encoding(found.compressed)
+    response = app.response_class(
+        found.body if encoding is None else found.compressed[encoding], mimetype=found.mimetype
+    )
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+@app.route("/metrics")
+def metrics_text():
+    if METRICS_TOKEN is not None:
+        authorization = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(authorization, f"Bearer {METRICS_TOKEN}"):
+            return jsonify({"error": "invalid metrics token"}), 401
+    else:
+        denied = _require_access_code()
+        if denied is not None:
+            return denied
+
+    boards = registry.boards()
+    gauges = {
+        "brainstorm_boards": ("Boards in this process.", len(boards)),
+        "brainstorm_participants": (
+            "Participants on all boards.",
+            sum(len(current.participants) for current in boards),
+        ),
+        "brainstorm_notes": ("Notes on all boards.", sum(len(current.notes) for current in boards)),
+        "brainstorm_vote_points": (
+            "Vote points allocated on all boards.",
+            sum(sum(list(current.spent_points.values())) for current in boards),
+        ),
+    }
+    return app.response_class(
+        metrics.render(gauges), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.route("/api/status")
 def status():
     return jsonify(
         {
-            "phase": board.phase.value,
-            "participants_count": len(board.participants),
-            "notes_count": len(board.notes),
-            "votes_count": len(board.votes),
+            "phase": g.board.phase.value,
+            "participants_count": len(g.board.participants),
+            "notes_count": len(g.board.notes),
+            "votes_count": len(g.board.votes),
         }
     )
 
@@ -134,31 +498,198 @@ def join():
     if not isinstance(is_organizer, bool):
         return _bad_request("is_organizer must be boolean")
 
-    participant = board.join(name=name, is_organizer=is_organizer)
-    return jsonify(asdict(participant))
+    participant = g.board.join(name=name, is_organizer=is_organizer)
+    return jsonify(participant_to_dict(participant))
+
+
+def _serialize_event(event: Event) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {"version": event.version, "type": event.kind}
+    for key, value in event.data.items():
+        if isinstance(value, Note):
+            value = note_to_dict(value)
+        elif isinstance(value, Participant):
+            value = participant_to_dict(value)
+        elif isinstance(value, Phase):
+            value = value.value
+        payload[key] = value
+    return payload
+
+
+def _are_coordinates(*values: Any) -> bool:
+    # Flask's JSON parser accepts NaN and Infinity; neither is a position.
+    return all(isinstance(value, (int, float)) and math.isfinite(value) for value in values)
+
+
+def _parse_viewport(value: str) -> Viewport:
+    try:
+        x0, y0, x1, y1 = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("viewport must be x0,y0,x1,y1") from None
+    if not _are_coordinates(x0, y0, x1, y1) or x0 > x1 or y0 > y1:
+        raise ValueError("viewport must be x0,y0,x1,y1")
+    return x0, y0, x1, y1
+
+
+def _board_etag(version: int, viewport_param: Optional[str]) -> str:
+    return str(version) if viewport_param is None else f"{version}@{viewport_param}"
 
 
 @app.route("/api/board")
 def board_state():
-    votes_by_note: Dict[str, Dict[str, int]] = {}
-    for participant_name, allocations in board.votes.items():
-        for note_id, points in allocations.items():
-            votes_by_note.setdefault(note_id, {})[participant_name] = points
+    viewport_param = request.args.get("viewport")
+    viewport = None
+    if viewport_param is not None:
+        try:
+            viewport = _parse_viewport(viewport_param)
+        except ValueError as exc:
+            return _bad_request(str(exc))
+
+    not_modified = _not_modified(_board_etag(g.board.version, viewport_param))
+    if not_modified is not None:
+        return not_modified
+
+    cache = _state_caches.get(g.board)
+    if cache is None:
+        cache = _state_caches.setdefault(g.board, BoardStateCache())
+    encoding = _negotiate_encoding()
+    version, content_encoding, body = cache.encode_as(g.board, encoding, viewport)
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(_encoded_etag(_board_etag(version, viewport_param), content_encoding))
+    response.vary.add("Accept-Encoding")
+    if content_encoding is not None:
+        response.headers["Content-Encoding"] = content_encoding
+    return response
+
+
+@app.route("/api/results")
+def results():
+    # type=int would quietly turn ?limit=abc into the default.
+    try:
+        limit = int(request.args.get("limit", "10"))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return _bad_request("limit must be a positive integer")
+
+    # Read before ranking: a write in between only makes the tag older, never
+    # lets a stale body match it.
+    etag = f"{g.board.version}:results:{limit}"
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    ranked = [
+        {"rank": rank, "score": score, "sticky": note_to_dict(note)}
+        for rank, (note, score) in enumerate(g.board.top(limit), start=1)
+    ]
+    response = jsonify({"phase": g.board.phase.value, "results": ranked})
+    response.set_etag(etag)
+    return response
+
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@app.route("/api/export")
+def export():
+    export_format = request.args.get("format", default="ndjson")
+    if export_format not in EXPORT_MIMETYPES:
+        return _bad_request("format must be ndjson or csv")
+    # Only references to the immutable notes are held; each line is encoded
+    # as it is sent, so the body never exists in memory as a whole.
+    scored = g.board.scored_notes()
+    return Response(
+        export_lines(scored, export_format),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="board-{g.board.version}.{export_format}"'
+        },
+    )
 
-    return jsonify(
-        {
-            "phase": board.phase.value,
-            "participants": [asdict(p) for p in board.participants.values()],
-            "stickies": [
-                {
-                    **asdict(note),
-                    "created_at": note.created_at.isoformat() + "Z",
-                }
-                for note in board.notes.values()
-            ],
-            "votes": votes_by_note,
-            "scores": {note_id: board.note_score(note_id) for note_id in board.notes},
-        }
+
+def _changes_payload(current: Board, since: int) -> Dict[str, Any]:
+    events = current.changes_since(since)
+    if events is None:
+        return {"version": current.version, "resync": True, "events": []}
+    return {
+        "version": events[-1].version if events else since,
+        "resync": False,
+        "events": [_serialize_event(event) for event in events],
+    }
+
+
+def _drag_payload(current: Board) -> Dict[str, Any]:
+    seq = current.drag_seq
+    return {"seq": seq, "positions": current.live_positions()}
+
+
+def _wait_for_update(current: Board, version: int, drag_seq: int, timeout: float) -> None:
+    """Wait for a committed change, or for the next drag tick with new positions."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        # live_positions() also expires abandoned drags, ending the ticking.
+        if current.drag_positions and current.live_positions():
+            time.sleep(DRAG_TICK)
+        else:
+            current.wait_for_change(version, deadline - time.monotonic(), drag_seq)
+        if current.version != version or current.drag_seq != drag_seq:
+            return
+
+
+@app.route("/api/board/changes")
+def board_changes():
+    since = request.args.get("since", type=int)
+    if since is None:
+        return _bad_request("since must be integer")
+    drag_seq: Optional[int] = request.args.get("drag_seq", type=int)
+    if drag_seq is None:
+        drag_seq = g.board.drag_seq
+    wait = request.args.get("wait", default=0.0, type=float)
+    if wait > 0:
+        _wait_for_update(g.board, since, drag_seq, min(wait, LONG_POLL_TIMEOUT))
+    payload = _changes_payload(g.board, since)
+    payload["drag"] = _drag_payload(g.board)
+    return jsonify(payload)
+
+
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    return f"id: {payload['version']}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route("/api/board/stream")
+def board_stream():
+    since = request.headers.get("Last-Event-ID", type=int)
+    if since is None:
+        since = request.args.get("since", type=int)
+    if since is None:
+        return _bad_request("since must be integer")
+    current = g.board
+
+    def generate() -> Iterator[str]:
+        version = since
+        drag_seq = -1
+        yield _sse("ready", {"version": version})
+        last_sent = time.monotonic()
+        while True:
+            _wait_for_update(current, version, drag_seq, STREAM_HEARTBEAT)
+            if current.version != version:
+                payload = _changes_payload(current, version)
+                version = payload["version"]
+                last_sent = time.monotonic()
+                yield _sse("changes", payload)
+            if current.drag_seq != drag_seq:
+                drag = _drag_payload(current)
+                drag_seq = drag["seq"]
+                last_sent = time.monotonic()
+                yield _sse("drag", {"version": version, **drag})
+            if time.monotonic() - last_sent >= STREAM_HEARTBEAT:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -177,16 +708,69 @@ def add_sticky():
         return _bad_request("name is required")
     if not isinstance(text, str) or text == "":
         return _bad_request("text is required")
-    if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+    if not _are_coordinates(x, y):
         return _bad_request("coordinates must be numeric")
 
-    note = board.add_note(author_name=name, text=text, x=float(x), y=float(y))
-    return jsonify(
-        {
-            **asdict(note),
-            "created_at": note.created_at.isoformat() + "Z",
-        }
-    ), 201
+    note = g.board.add_note(author_name=name, text=text, x=float(x), y=float(y))
+    return jsonify(note_to_dict(note)), 201
+
+
+def _parse_note_draft(requester: str, line: bytes) -> NoteDraft:
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        raise ValueError("invalid JSON") from None
+    if not isinstance(entry, dict):
+        raise ValueError("line must be an object")
+    # Lines from /api/export carry author_name; lines without one are the requester's.
+    author_name = entry.get("author_name", requester)
+    text = entry.get("text")
+    x = entry.get("x")
+    y = entry.get("y")
+    if not author_name or not isinstance(author_name, str):
+        raise ValueError("author_name must be a non-empty string")
+    if not isinstance(text, str) or text == "":
+        raise ValueError("text is required")
+    if not _are_coordinates(x, y):
+        raise ValueError("coordinates must be numeric")
+    return NoteDraft(author_name=author_name, text=text, x=float(x), y=float(y))
+
+
+IMPORT_REJECTIONS = {
+    NotFound: "unknown participant",
+    NoteTextTooLong: NOTE_TEXT_TOO_LONG,
+    StickyLimitExceeded: STICKY_LIMIT_REACHED,
+}
+
+
+@app.route("/api/stickies/import", methods=["POST"])
+def import_stickies():
+    name = request.args.get("name")
+    if not name:
+        return _bad_request("name is required")
+
+    # Parse outside the board lock; only valid drafts reach the board.
+    drafts = []
+    lines = []
+    errors = []
+    # The raw request stream reads lines a byte at a time; buffer it.
+    body = io.BufferedReader(request.stream)
+    for number, line in enumerate(body, start=1):
+        if not line.strip():
+            continue
+        try:
+            drafts.append(_parse_note_draft(name, line))
+        except ValueError as exc:
+            errors.append({"line": number, "error": str(exc)})
+        else:
+            lines.append(number)
+
+    imported, rejected = g.board.import_notes(requester=name, drafts=drafts)
+    errors += [
+        {"line": lines[index], "error": IMPORT_REJECTIONS[type(exc)]} for index, exc in rejected
+    ]
+    errors.sort(key=lambda error: error["line"])
+    return jsonify({"imported": imported, "errors": errors, "version": g.board.version})
 
 
 @app.route("/api/stickies/<note_id>/move", methods=["POST"])
@@ -199,15 +783,34 @@ def move_sticky(note_id: str):
     except ValueError as exc:
         return _bad_request(str(exc))
 
-    if not name or name not in board.participants:
+    if not name or name not in g.board.participants:
         return _bad_request("unknown participant")
-    if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+    if not _are_coordinates(x, y):
         return _bad_request("coordinates must be numeric")
 
-    board.move_note(note_id, float(x), float(y))
+    g.board.move_note(note_id, float(x), float(y))
     return jsonify({"status": "moved"})
 
 
+@app.route("/api/stickies/<note_id>/drag", methods=["POST"])
+def drag_sticky(note_id: str):
+    try:
+        payload = _get_json_payload()
+        name = payload.get("name")
+        x = payload.get("x")
+        y = payload.get("y")
+    except ValueError as exc:
+        return _bad_request(str(exc))
+
+    if not name or name not in g.board.participants:
+        return _bad_request("unknown participant")
+    if not _are_coordinates(x, y):
+        return _bad_request("coordinates must be numeric")
+
+    g.board.drag_note(note_id, float(x), float(y))
+    return jsonify({"status": "dragging"})
+
+
 @app.route("/api/stickies/<note_id>", methods=["DELETE"])
 def delete_sticky(note_id: str):
     try:
@@ -219,7 +822,7 @@ def delete_sticky(note_id: str):
     if not name or not isinstance(name, str):
         return _bad_request("name is required")
 
-    board.delete_note(note_id, requester=name)
+    g.board.delete_note(note_id, requester=name)
     return jsonify({"status": "deleted"})
 
 
@@ -239,8 +842,8 @@ def change_phase():
     except Exception:
         return _bad_request("invalid phase")
 
-    board.change_phase(requester=name, new_phase=new_phase)
-    return jsonify({"phase": board.phase.value})
+    g.board.change_phase(requester=name, new_phase=new_phase)
+    return jsonify({"phase": g.board.phase.value})
 
 
 @app.route("/api/votes", methods=["POST"])
@@ -260,10 +863,57 @@ def set_vote():
     if not isinstance(points, int):
         return _bad_request("points must be integer")
 
-    board.set_vote(participant_name=name, note_id=sticky_id, points=points)
+    g.board.set_vote(participant_name=name, note_id=sticky_id, points=points)
     return jsonify({"status": "ok"})
 
 
+def _parse_batch_command(name: str, operation: Any) -> Command:
+    if not isinstance(operation, dict):
+        raise ValueError("operation must be an object")
+    op = operation.get("op")
+    sticky_id = operation.get("sticky_id")
+    if not sticky_id or not isinstance(sticky_id, str):
+        raise ValueError("sticky_id is required")
+    if op == "move":
+        x = operation.get("x")
+        y = operation.get("y")
+        if not _are_coordinates(x, y):
+            raise ValueError("coordinates must be numeric")
+        return MoveNote(note_id=sticky_id, x=float(x), y=float(y))
+    if op == "vote":
+        points = operation.get("points")
+        if not isinstance(points, int):
+            raise ValueError("points must be integer")
+        return SetVote(participant_name=name, note_id=sticky_id, points=points)
+    if op == "delete":
+        return DeleteNote(note_id=sticky_id, requester=name)
+    raise ValueError("op must be move, vote or delete")
+
+
+@app.route("/api/batch", methods=["POST"])
+def apply_batch():
+    try:
+        payload = _get_json_payload()
+        name = payload.get("name")
+        operations = payload.get("operations")
+    except ValueError as exc:
+        return _bad_request(str(exc))
+
+    if not name or name not in g.board.participants:
+        return _bad_request("unknown participant")
+    if not isinstance(operations, list):
+        return _bad_request("operations must be a list")
+    commands = []
+    for index, operation in enumerate(operations):
+        try:
+            commands.append(_parse_batch_command(name, operation))
+        except ValueError as exc:
+            return _bad_request(f"operation {index}: {exc}")
+
+    version = g.board.apply_batch(commands)
+    return jsonify({"status": "ok", "version": version})
+
+
 @app.route("/api/reset", methods=["POST"])
 def reset_board():
     try:
@@ -275,8 +925,30 @@ def reset_board():
     if not name or not isinstance(name, str):
         return _bad_request("name is required")
 
-    board.reset(requester=name)
-    return jsonify({"status": "reset", "access_code": board.access_code})
+    old_code = g.board.access_code
+    g.board.reset(requester=name)
+    registry.rekey(old_code, g.board)
+    return jsonify({"status": "reset", "access_code": g.board.access_code})
+
+
+@app.route("/api/boards", methods=["POST"])
+def create_board():
+    try:
+        payload = _get_json_payload()
+        name = payload.get("name")
+    except ValueError as exc:
+        return _bad_request(str(exc))
+
+    if not name or not isinstance(name, str):
+        return _bad_request("name is required")
+
+    g.board.require_organizer(name)
+    new_board = registry.create()
+    if DATA_DIR is not None:
+        persist(new_board, os.path.join(DATA_DIR, uuid.uuid4().hex))
+    if RECORD_DIR is not None:
+        _record_workload(new_board)
+    return jsonify({"access_code": new_board.access_code}), 201
 
 
 if __name__ == "__main__":
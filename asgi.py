@@ -0,0 +1,390 @@
+"""Asyncio (ASGI) entry point serving the same board as ``app.py``.
+
+Run with any ASGI server, e.g.:
+
+    uvicorn asgi:application --port 5000
+
+Waiting endpoints -- ``/api/board/stream`` and ``/api/board/changes`` with
+``wait`` -- are served on the event loop, so an idle client costs a coroutine
+instead of a thread. Every other request is handed to the Flask app in a worker
+thread, which keeps one set of routes and one ``@app.errorhandler`` mapping for
+both entry points.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import sys
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import app as wsgi
+from brainstorm.domain import Board
+from brainstorm.replication import OwnerUnavailable
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Headers = List[Tuple[bytes, bytes]]
+
+JSON_HEADERS: Headers = [(b"content-type", b"application/json")]
+# Streamed WSGI bodies are sent in pieces of about this size.
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_HEADERS: Headers = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+]
+
+
+class _BoardSignal:
+    """Wakes every coroutine of one event loop waiting on one board."""
+
+    def __init__(self, board: Board, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+        board.add_listener(self._on_change)
+
+    def _on_change(self) -> None:
+        # Runs on the writing thread, under the board lock.
+        self._loop.call_soon_threadsafe(self._fire)
+
+    def _fire(self) -> None:
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+_signals: "weakref.WeakKeyDictionary[Board, _BoardSignal]" = weakref.WeakKeyDictionary()
+
+
+def _signal_for(board: Board) -> _BoardSignal:
+    signal = _signals.get(board)
+    if signal is None or signal._loop is not asyncio.get_running_loop():
+        if signal is not None:
+            board.remove_listener(signal._on_change)
+        signal = _signals[board] = _BoardSignal(board, asyncio.get_running_loop())
+    return signal
+
+
+async def _wait_for_update(current: Board, version: int, drag_seq: int, timeout: float) -> None:
+    """Async twin of ``app._wait_for_update``."""
+    signal = _signal_for(current)
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        if current.version != version or current.drag_seq != drag_seq:
+            return
+        # live_positions() also expires abandoned drags, ending the ticking.
+        if current.drag_positions and current.live_positions():
+            await asyncio.sleep(min(wsgi.DRAG_TICK, remaining))
+        else:
+            await signal.wait(remaining)
+
+
+async def _send_response(send: Send, status: int, headers: Headers, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(
+    send: Send, status: int, payload: Dict[str, Any], headers: Optional[Headers] = None
+) -> None:
+    headers = JSON_HEADERS + (headers or [])
+    await _send_response(send, status, headers, json.dumps(payload).encode())
+
+
+def _retry_later(seconds: float) -> Headers:
+    return [(b"retry-after", wsgi.retry_after(seconds).encode())]
+
+
+def _observed(send: Send, scope: Scope, started: float, current: Optional[Board]) -> Send:
+    """``send`` labelling the response with the board version and reporting it to the metrics.
+
+    Does for the natively served routes what Flask's ``after_request`` hooks
+    do for the rest. Like there, a stream is reported when it starts, without
+    a size; any other response once its body is complete.
+    """
+    route, method = scope["path"], scope["method"]
+    status = 0
+    size = 0
+
+    async def send_observed(message: Message) -> None:
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = list(message["headers"])
+            if current is not None:
+                name, value = wsgi.board_version_header(current)
+                headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+            await send({**message, "headers": headers})
+            if STREAM_HEADERS[0] in headers:
+                wsgi.observe_request(route, method, status, started, None)
+            return
+        await send(message)
+        size += len(message.get("body", b""))
+        if not message.get("more_body", False):
+            wsgi.observe_request(route, method, status, started, size)
+
+    return send_observed
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _int_or_none(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _float_or(value: Optional[str], default: float) -> Optional[float]:
+    try:
+        return float(value) if value is not None else default
+    except ValueError:
+        return None
+
+
+def _waits(scope: Scope, query: Dict[str, str]) -> bool:
+    if scope["method"] != "GET":
+        return False
+    if scope["path"] == "/api/board/stream":
+        return True
+    if scope["path"] == "/api/board/changes":
+        return (_float_or(query.get("wait"), 0.0) or 0.0) > 0
+    return False
+
+
+async def _board_changes(send: Send, current: Board, query: Dict[str, str]) -> None:
+    # Mirrors app.board_changes, including Flask's fallback to the default for
+    # unparsable optional arguments.
+    since = _int_or_none(query.get("since"))
+    if since is None:
+        await _send_json(send, 400, {"error": "since must be integer"})
+        return
+    drag_seq = _int_or_none(query.get("drag_seq"))
+    if drag_seq is None:
+        drag_seq = current.drag_seq
+    wait = _float_or(query.get("wait"), 0.0) or 0.0
+    await _wait_for_update(current, since, drag_seq, min(wait, wsgi.LONG_POLL_TIMEOUT))
+    payload = wsgi._changes_payload(current, since)
+    payload["drag"] = wsgi._drag_payload(current)
+    await _send_json(send, 200, payload)
+
+
+async def _stream_events(send: Send, current: Board, since: int) -> None:
+    # Mirrors the generator in app.board_stream.
+    await send({"type": "http.response.start", "status": 200, "headers": STREAM_HEADERS})
+
+    async def emit(chunk: str) -> None:
+        await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+
+    version = since
+    drag_seq = -1
+    await emit(wsgi._sse("ready", {"version": version}))
+    last_sent = time.monotonic()
+    while True:
+        await _wait_for_update(current, version, drag_seq, wsgi.STREAM_HEARTBEAT)
+        if current.version != version:
+            payload = wsgi._changes_payload(current, version)
+            version = payload["version"]
+            last_sent = time.monotonic()
+            await emit(wsgi._sse("changes", payload))
+        if current.drag_seq != drag_seq:
+            drag = wsgi._drag_payload(current)
+            drag_seq = drag["seq"]
+            last_sent = time.monotonic()
+            await emit(wsgi._sse("drag", {"version": version, **drag}))
+        if time.monotonic() - last_sent >= wsgi.STREAM_HEARTBEAT:
+            last_sent = time.monotonic()
+            await emit(": keepalive\n\n")
+
+
+async def _until_disconnect(receive: Receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _board_stream(
+    send: Send, receive: Receive, scope: Scope, current: Board, query: Dict[str, str]
+) -> None:
+    since = _int_or_none(_header(scope, b"last-event-id"))
+    if since is None:
+        since = _int_or_none(query.get("since"))
+    if since is None:
+        await _send_json(send, 400, {"error": "since must be integer"})
+        return
+    stream = asyncio.ensure_future(_stream_events(send, current, since))
+    disconnect = asyncio.ensure_future(_until_disconnect(receive))
+    try:
+        await asyncio.wait({stream, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stream.cancel()
+        disconnect.cancel()
+    if stream.done() and not stream.cancelled() and stream.exception() is not None:
+        raise stream.exception()
+
+
+def _wsgi_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ: Dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        # The body is already buffered, so its length is known even if it was chunked.
+        "CONTENT_LENGTH": str(len(body)),
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for key, value in scope["headers"]:
+        name = key.decode("latin-1").upper().replace("-", "_")
+        if name == "CONTENT_LENGTH":
+            continue
+        if name == "CONTENT_TYPE":
+            environ[name] = value.decode("latin-1")
+            continue
+        name = f"HTTP_{name}"
+        text = value.decode("latin-1")
+        environ[name] = f"{environ[name]},{text}" if name in environ else text
+    return environ
+
+
+def _read_chunk(body: Iterator[bytes]) -> Tuple[bytes, bool]:
+    """About ``STREAM_CHUNK_SIZE`` bytes of a WSGI body, and whether it has ended."""
+    parts = []
+    size = 0
+    for part in body:
+        parts.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            return b"".join(parts), False
+    return b"".join(parts), True
+
+
+def _close_wsgi(result: Iterable[bytes]) -> None:
+    close = getattr(result, "close", None)
+    if close is not None:
+        close()
+
+
+def _call_wsgi(environ: Dict[str, Any]) -> Tuple[int, Headers, Iterable[bytes], bytes, bool]:
+    """Run the WSGI app up to its first body chunk.
+
+    Returns ``(status, headers, result, first chunk, ended)``. When the body has
+    not ended, the caller reads the rest of ``result`` and closes it.
+    """
+    started: Dict[str, Any] = {}
+
+    def start_response(status: str, headers: List[Tuple[str, str]], exc_info: Any = None) -> None:
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers
+        ]
+
+    result: Iterable[bytes] = wsgi.app.wsgi_app(environ, start_response)
+    ended = True
+    try:
+        chunk, ended = _read_chunk(iter(result))
+    finally:
+        if ended:
+            _close_wsgi(result)
+    return started["status"], started["headers"], result, chunk, ended
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _http(scope: Scope, receive: Receive, send: Send) -> None:
+    query = {
+        key: values[0]
+        for key, values in parse_qs(scope["query_string"].decode("latin-1")).items()
+    }
+    if _waits(scope, query):
+        started = time.perf_counter()
+        code = _header(scope, b"x-access-code") or query.get("access_code")
+        try:
+            current = wsgi.resolve_board(code)
+        except OwnerUnavailable:
+            send = _observed(send, scope, started, None)
+            retry = _retry_later(wsgi.BUSY_RETRY_AFTER)
+            await _send_json(send, 503, {"error": "board owner unavailable"}, retry)
+            return
+        send = _observed(send, scope, started, current)
+        if current is None:
+            await _send_json(send, 401, {"error": "invalid access code"})
+            return
+        wait = wsgi.rate_limit_wait(current, scope["method"], None)
+        if wait:
+            await _send_json(send, 429, {"error": "too many requests"}, _retry_later(wait))
+        elif scope["path"] == "/api/board/stream":
+            await _board_stream(send, receive, scope, current, query)
+        else:
+            await _board_changes(send, current, query)
+        return
+
+    environ = _wsgi_environ(scope, await _read_body(receive))
+    loop = asyncio.get_running_loop()
+    status, headers, result, chunk, ended = await loop.run_in_executor(None, _call_wsgi, environ)
+    if ended:
+        await _send_response(send, status, headers, chunk)
+        return
+    # A streamed body (/api/export) is passed on chunk by chunk, never held whole.
+    try:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        body = iter(result)
+        while not ended:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            chunk, ended = await loop.run_in_executor(None, _read_chunk, body)
+        await send({"type": "http.response.body", "body": chunk})
+    finally:
+        _close_wsgi(result)
+
+
+async def _lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] == "http":
+        await _http(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await _lifespan(receive, send)
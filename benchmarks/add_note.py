@@ -0,0 +1,48 @@
+"""Micro-benchmark: Board.add_note latency against the number of existing notes.
+
+Run from the repository root:
+
+    python -m benchmarks.add_note
+"""
+
+import random
+import statistics
+import time
+
+from brainstorm.domain import MAX_NOTES_PER_PARTICIPANT, Board
+
+BOARD_SIZES = [10, 100, 1_000, 10_000]
+SAMPLES = 200
+
+
+def _filled_board(size: int) -> Board:
+    board = Board(rng=random.Random(0))
+    for i in range(size):
+        author = f"author-{i // MAX_NOTES_PER_PARTICIPANT}"
+        if author not in board.participants:
+            board.join(author, False)
+        board.add_note(author, f"idea {i}", 0, 0)
+    return board
+
+
+def measure(size: int) -> float:
+    """Median add_note latency in microseconds on a board holding ``size`` notes."""
+    board = _filled_board(size)
+    board.join("bench", False)
+    timings = []
+    for i in range(SAMPLES):
+        start = time.perf_counter()
+        note = board.add_note("bench", f"bench {i}", 0, 0)
+        timings.append(time.perf_counter() - start)
+        board.delete_note(note.id, "bench")
+    return statistics.median(timings) * 1_000_000
+
+
+def main() -> None:
+    print(f"{'notes':>8}  {'add_note median (us)':>20}")
+    for size in BOARD_SIZES:
+        print(f"{size:>8}  {measure(size):>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
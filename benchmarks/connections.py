@@ -0,0 +1,152 @@
+"""Load benchmark: idle push connections vs. request latency, threaded vs. asyncio.
+
+Starts the server pinned to one CPU core -- first the threaded Flask server
+from ``app.py``, then the ASGI entry point from ``asgi.py`` under uvicorn --
+opens N idle ``/api/board/stream`` connections, and measures ``/api/status``
+latency while they stay open. Needs uvicorn (``pip install uvicorn``).
+
+    python -m benchmarks.connections
+"""
+
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from brainstorm.domain import Board
+
+IDLE_CONNECTIONS = [0, 100, 1_000, 4_000]
+PROBES = 200
+CONNECT_TIMEOUT = 10.0
+
+# Both servers start from the same seeded board, so the access code is known.
+SETUP = (
+    "import random, app; from brainstorm.domain import Board; "
+    "app.set_board(Board(random.Random(0)))"
+)
+SERVERS = {
+    "threaded": "import logging; logging.getLogger('werkzeug').disabled = True; "
+    "app.app.run(port={port}, threaded=True)",
+    "asyncio": "import uvicorn, asgi; "
+    "uvicorn.run(asgi.application, port={port}, log_level='error', backlog=8192)",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(kind: str, port: int) -> subprocess.Popen:
+    code = f"{SETUP}; {SERVERS[kind].format(port=port)}"
+    process = subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        preexec_fn=lambda: os.sched_setaffinity(0, {0}),
+    )
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def _open_stream(
+    port: int, code: str
+) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            f"GET /api/board/stream?since=0&access_code={code} HTTP/1.1\r\n"
+            "Host: localhost\r\n\r\n".encode()
+        )
+        await writer.drain()
+        data = b""
+        while b"event: ready" not in data:
+            chunk = await reader.read(4096)
+            if not chunk:
+                return None
+            data += chunk
+        return reader, writer
+    except OSError:
+        return None
+
+
+async def _probe(port: int, code: str) -> float:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        "GET /api/status HTTP/1.1\r\nHost: localhost\r\n"
+        f"X-Access-Code: {code}\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    elapsed = time.perf_counter() - start
+    writer.close()
+    if not response.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(f"unexpected response: {response[:60]!r}")
+    return elapsed
+
+
+async def _measure(port: int, code: str, idle: int) -> Tuple[int, List[float]]:
+    opening = asyncio.gather(*(_open_stream(port, code) for _ in range(idle)))
+    streams = await asyncio.wait_for(opening, CONNECT_TIMEOUT * 3)
+    held = [stream for stream in streams if stream is not None]
+    try:
+        timings = []
+        for _ in range(PROBES):
+            timings.append(await asyncio.wait_for(_probe(port, code), CONNECT_TIMEOUT))
+    finally:
+        for _, writer in held:
+            writer.close()
+    return len(held), timings
+
+
+def run(kind: str) -> None:
+    code = Board(random.Random(0)).access_code
+    for idle in IDLE_CONNECTIONS:
+        port = _free_port()
+        process = _start(kind, port)
+        try:
+            held, timings = asyncio.run(_measure(port, code, idle))
+            rss = _rss_mb(process.pid)
+            timings.sort()
+            p50 = statistics.median(timings) * 1000
+            p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+            print(f"{kind:>9}  {idle:>6}  {held:>6}  {p50:>9.2f}  {p99:>9.2f}  {rss:>7.1f}")
+        except (OSError, asyncio.TimeoutError, RuntimeError) as exc:
+            print(f"{kind:>9}  {idle:>6}  failed: {exc!r}")
+        finally:
+            process.kill()
+            process.wait()
+
+
+def main() -> None:
+    print(
+        f"{'server':>9}  {'idle':>6}  {'held':>6}  {'p50 (ms)':>9}  {'p99 (ms)':>9}  {'RSS MB':>7}"
+    )
+    for kind in SERVERS:
+        run(kind)
+
+
+if __name__ == "__main__":
+    main()
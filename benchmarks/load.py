@@ -0,0 +1,327 @@
+"""Load benchmark: simulated workshop participants against the HTTP API.
+
+Each participant runs in its own thread and goes through a workshop: join,
+add stickies while GENERATING (dragging some of them around), then move
+vote points between notes while VOTING. It polls GET /api/board every
+``--poll-interval`` seconds the whole time, as the board page does without
+push. The run takes place on a fresh board, so no existing board is touched.
+
+By default the Flask app runs in-process (test client); ``--url`` targets a
+live server instead. There the run's board is created through POST
+/api/boards, on behalf of an organizer already on an existing board, given by
+``--access-code`` and ``--organizer``. Prints throughput and p50/p95/p99 per endpoint, and
+with ``--output`` saves them as JSON; ``--baseline`` compares against such a
+file.
+
+    python -m benchmarks.load --participants 50
+    python -m benchmarks.load --url http://127.0.0.1:5000 --access-code ABC123 \
+        --organizer benchmark --output run.json
+    python -m benchmarks.load --baseline run.json
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DRAG_STEPS = 10
+DRAG_INTERVAL = 0.05
+
+
+class InProcessTarget:
+    """Sends requests to the Flask app through its test client."""
+
+    name = "in-process"
+
+    def __init__(self) -> None:
+        import app
+
+        self.app = app
+
+    def client(self) -> "InProcessClient":
+        return InProcessClient(self.app.app.test_client())
+
+    def create_board(self, args: argparse.Namespace) -> str:
+        return self.app.registry.create().access_code
+
+
+class InProcessClient:
+    def __init__(self, test_client: Any) -> None:
+        self.test_client = test_client
+
+    def request(
+        self, method: str, path: str, code: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any]:
+        response = self.test_client.open(
+            path, method=method, json=payload, headers={"X-Access-Code": code}
+        )
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpTarget:
+    """Sends requests to a live server, one keep-alive connection per participant."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        self.name = url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+
+    def client(self) -> "HttpClient":
+        return HttpClient(self.host, self.port)
+
+    def create_board(self, args: argparse.Namespace) -> str:
+        payload = {"name": args.organizer}
+        status, created = self.client().request("POST", "/api/boards", args.access_code, payload)
+        if status != 201:
+            raise SystemExit(f"POST /api/boards failed with {status}: {created}")
+        return created["access_code"]
+
+
+class HttpClient:
+    def __init__(self, host: str, port: int) -> None:
+        self.connection = http.client.HTTPConnection(host, port, timeout=30)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        code: str,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, Any]:
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"X-Access-Code": code, "Content-Type": "application/json"}
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            # The server closed the keep-alive connection; retry once on a new one.
+            self.connection.close()
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+
+class Recorder:
+    """Latencies and error counts per endpoint, shared by all participants."""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        client: Any,
+        endpoint: str,
+        method: str,
+        path: str,
+        code: str,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        start = time.perf_counter()
+        status, data = client.request(method, path, code, payload)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.timings[endpoint].append(elapsed)
+            if status >= 400:
+                self.errors[endpoint] += 1
+        return data
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for endpoint, timings in sorted(self.timings.items()):
+            ordered = sorted(timings)
+            result[endpoint] = {
+                "count": len(ordered),
+                "errors": self.errors[endpoint],
+                "rps": len(ordered) / duration,
+                "p50_ms": statistics.median(ordered) * 1000,
+                "p95_ms": _percentile(ordered, 0.95) * 1000,
+                "p99_ms": _percentile(ordered, 0.99) * 1000,
+            }
+        return result
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Participant(threading.Thread):
+    def __init__(
+        self,
+        index: int,
+        target: Any,
+        code: str,
+        args: argparse.Namespace,
+        recorder: Recorder,
+        voting: threading.Barrier,
+    ) -> None:
+        super().__init__(name=f"participant-{index}", daemon=True)
+        self.name_on_board = f"participant-{index}"
+        self.client = target.client()
+        self.code = code
+        self.args = args
+        self.recorder = recorder
+        self.voting = voting
+        self.rng = random.Random(index)
+        self.next_poll = time.monotonic() + self.rng.uniform(0, args.poll_interval)
+
+    def call(self, endpoint: str, method: str, path: str, payload=None) -> Any:
+        return self.recorder.call(self.client, endpoint, method, path, self.code, payload)
+
+    def pause(self, seconds: float) -> None:
+        """Wait like a user would, polling the board whenever a poll is due."""
+        end = time.monotonic() + seconds
+        while True:
+            now = time.monotonic()
+            if now >= self.next_poll:
+                self.call("GET /api/board", "GET", "/api/board")
+                self.next_poll = now + self.args.poll_interval
+            elif now >= end:
+                return
+            else:
+                time.sleep(min(end, self.next_poll) - now)
+
+    def drag(self, note_id: str) -> None:
+        x, y = self.rng.uniform(0, 1500), self.rng.uniform(0, 900)
+        for _ in range(DRAG_STEPS):
+            x, y = x + self.rng.uniform(-20, 20), y + self.rng.uniform(-20, 20)
+            position = {"name": self.name_on_board, "x": x, "y": y}
+            path = f"/api/stickies/{note_id}/drag"
+            self.call("POST /api/stickies/<id>/drag", "POST", path, position)
+            self.pause(DRAG_INTERVAL)
+        path = f"/api/stickies/{note_id}/move"
+        self.call("POST /api/stickies/<id>/move", "POST", path, position)
+
+    def run(self) -> None:
+        me = self.name_on_board
+        self.call("POST /api/join", "POST", "/api/join", {"name": me, "is_organizer": False})
+        own = []
+        for i in range(self.args.notes):
+            x, y = self.rng.uniform(0, 1500), self.rng.uniform(0, 900)
+            note = {"name": me, "text": f"idea {i} from {me}", "x": x, "y": y}
+            created = self.call("POST /api/stickies", "POST", "/api/stickies", note)
+            if created:
+                own.append(created["id"])
+            self.pause(self.rng.expovariate(1 / self.args.think))
+            if own and self.rng.random() < 0.3:
+                self.drag(self.rng.choice(own))
+
+        self.voting.wait()  # the organizer switches the phase between the two waits
+        self.voting.wait()
+        board = self.call("GET /api/board", "GET", "/api/board") or {"stickies": []}
+        note_ids = [sticky["id"] for sticky in board["stickies"]]
+        allocation: Dict[str, int] = {}
+        for _ in range(self.args.vote_rounds):
+            # Take points off one note and put them on another, within the budget of 5.
+            if allocation:
+                taken = self.rng.choice(sorted(allocation))
+                vote = {"name": me, "sticky_id": taken, "points": 0}
+                self.call("POST /api/votes", "POST", "/api/votes", vote)
+                del allocation[taken]
+            note_id = self.rng.choice(note_ids)
+            points = min(5 - sum(allocation.values()), self.rng.randint(1, 3))
+            vote = {"name": me, "sticky_id": note_id, "points": points}
+            self.call("POST /api/votes", "POST", "/api/votes", vote)
+            allocation[note_id] = points
+            self.pause(self.rng.expovariate(1 / self.args.think))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    recorder = Recorder()
+    organizer = target.client()
+    org = {"name": f"load-organizer-{int(time.time())}", "is_organizer": True}
+    code = target.create_board(args)
+    organizer.request("POST", "/api/join", code, org)
+
+    voting = threading.Barrier(args.participants + 1)
+    participants = [
+        Participant(i, target, code, args, recorder, voting) for i in range(args.participants)
+    ]
+    start = time.perf_counter()
+    for participant in participants:
+        participant.start()
+    voting.wait()
+    organizer.request("POST", "/api/phase", code, {"name": org["name"], "phase": "VOTING"})
+    voting.wait()
+    for participant in participants:
+        participant.join()
+    duration = time.perf_counter() - start
+
+    return {
+        "target": target.name,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "participants": args.participants,
+        "duration_s": duration,
+        "total_rps": sum(len(t) for t in recorder.timings.values()) / duration,
+        "endpoints": recorder.summary(duration),
+    }
+
+
+def report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(
+        f"{results['participants']} participants against {results['target']}: "
+        f"{results['duration_s']:.1f} s, {results['total_rps']:.0f} req/s"
+    )
+    header = (
+        f"{'endpoint':<32} {'count':>6} {'errors':>6} {'req/s':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    if baseline:
+        header += f" {'p99 vs base':>12}"
+    print(header)
+    for endpoint, stats in results["endpoints"].items():
+        line = (
+            f"{endpoint:<32} {stats['count']:>6} {stats['errors']:>6} {stats['rps']:>7.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}"
+        )
+        before = baseline["endpoints"].get(endpoint) if baseline else None
+        if before:
+            change = (stats["p99_ms"] / before["p99_ms"] - 1) * 100
+            line += f" {change:>+11.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--url", help="live server, e.g. http://127.0.0.1:5000")
+    parser.add_argument("--access-code", help="with --url: a board --organizer is on")
+    parser.add_argument("--organizer", help="with --url: creates the run's board")
+    parser.add_argument("--participants", type=int, default=30)
+    parser.add_argument("--notes", type=int, default=5, help="stickies per participant")
+    parser.add_argument("--vote-rounds", type=int, default=5)
+    parser.add_argument("--think", type=float, default=0.3, help="mean pause between actions")
+    parser.add_argument("--poll-interval", type=float, default=2.5)
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+    if args.url and not (args.access_code and args.organizer):
+        parser.error("--url needs --access-code and --organizer")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    results = run(args)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Memory benchmark: bytes per note and per participant, measured with tracemalloc.
+
+Compares the original representation (dict-backed dataclasses with datetime
+timestamps) with the current slotted entities, and reports what a populated
+Board costs per note including its indexes.
+
+    python -m benchmarks.memory
+"""
+
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from brainstorm.domain import COLORS, MAX_NOTES_PER_PARTICIPANT, Board, Note, Participant
+
+COUNT = 10_000
+AUTHORS = [f"author-{i}" for i in range(20)]
+
+
+@dataclass
+class LegacyParticipant:
+    name: str
+    is_organizer: bool
+    color: str
+
+
+@dataclass
+class LegacyNote:
+    id: str
+    text: str
+    author_name: str
+    color: str
+    x: float
+    y: float
+    created_at: datetime
+
+
+def _bytes_per_object(build: Callable[[int], object]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects: List[object] = [build(i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of their cost.
+    return (after - before) / len(objects) - 8
+
+
+def _note_text(i: int) -> str:
+    return f"idea {i}"
+
+
+def _note_id(i: int) -> str:
+    return f"{i:032x}"
+
+
+def legacy_note(i: int) -> LegacyNote:
+    return LegacyNote(
+        id=_note_id(i),
+        text=_note_text(i),
+        author_name=AUTHORS[i % len(AUTHORS)],
+        color=COLORS[i % len(COLORS)],
+        x=float(i),
+        y=float(i),
+        created_at=datetime.utcnow(),
+    )
+
+
+def current_note(i: int) -> Note:
+    return Note(
+        id=_note_id(i),
+        text=_note_text(i),
+        author_name=AUTHORS[i % len(AUTHORS)],
+        color=COLORS[i % len(COLORS)],
+        x=float(i),
+        y=float(i),
+        created_at=time.time(),
+    )
+
+
+def legacy_participant(i: int) -> LegacyParticipant:
+    color = COLORS[i % len(COLORS)]
+    return LegacyParticipant(name=f"author-{i}", is_organizer=False, color=color)
+
+
+def current_participant(i: int) -> Participant:
+    color = COLORS[i % len(COLORS)]
+    return Participant(name=f"author-{i}", is_organizer=False, color=color)
+
+
+def board_bytes_per_note() -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board = Board(rng=random.Random(0))
+    for i in range(COUNT):
+        author = f"author-{i // MAX_NOTES_PER_PARTICIPANT}"
+        if author not in board.participants:
+            board.join(author, False)
+        board.add_note(author, _note_text(i), 0, 0)
+    board.events.clear()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(board.notes)
+
+
+def main() -> None:
+    rows = [
+        ("note", _bytes_per_object(legacy_note), _bytes_per_object(current_note)),
+        (
+            "participant",
+            _bytes_per_object(legacy_participant),
+            _bytes_per_object(current_participant),
+        ),
+    ]
+    print(f"{'entity':>12}  {'before (B)':>10}  {'after (B)':>10}")
+    for entity, before, after in rows:
+        print(f"{entity:>12}  {before:>10.0f}  {after:>10.0f}")
+    print(f"\nBoard with {COUNT} notes, incl. indexes: {board_bytes_per_note():.0f} B/note")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Persistence benchmark: restore time and the cost of journaling on writes.
+
+Builds a 10k-note board in a temporary directory -- a snapshot plus a journal
+tail of moves -- times restore_board, and compares move_note latency with and
+without a Journal attached.
+
+    python -m benchmarks.persistence
+"""
+
+import random
+import statistics
+import tempfile
+import time
+
+from brainstorm.domain import MAX_NOTES_PER_PARTICIPANT, Board
+from brainstorm.persistence import SNAPSHOT_EVERY, Journal, restore_board
+
+NOTES = 10_000
+SAMPLES = 2_000
+
+
+def _filled_board() -> Board:
+    board = Board(rng=random.Random(0))
+    for i in range(NOTES):
+        author = f"author-{i // MAX_NOTES_PER_PARTICIPANT}"
+        if author not in board.participants:
+            board.join(author, False)
+        board.add_note(author, f"idea {i}", (i % 100) * 40.0, (i // 100) * 40.0)
+    return board
+
+
+def _move_latency_us(board: Board) -> float:
+    note_ids = list(board.notes)
+    timings = []
+    for i in range(SAMPLES):
+        start = time.perf_counter()
+        board.move_note(note_ids[i % len(note_ids)], i, i)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1_000_000
+
+
+def main() -> None:
+    in_ram = _move_latency_us(_filled_board())
+
+    with tempfile.TemporaryDirectory() as directory:
+        board = _filled_board()
+        journal = Journal(board, directory, snapshot_every=SNAPSHOT_EVERY)
+        journaled = _move_latency_us(board)
+        # Leave a journal tail just short of the next snapshot.
+        note_ids = list(board.notes)
+        for i in range(SNAPSHOT_EVERY - 1 - SAMPLES % SNAPSHOT_EVERY):
+            board.move_note(note_ids[i], -i, -i)
+        journal.close()
+
+        start = time.perf_counter()
+        restored = restore_board(directory)
+        restore_ms = (time.perf_counter() - start) * 1000
+        assert restored.snapshot() == board.snapshot()
+
+    print(f"move_note median, in RAM:    {in_ram:8.2f} us")
+    print(f"move_note median, journaled: {journaled:8.2f} us")
+    print(f"restore {NOTES} notes + tail:  {restore_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Replay a recorded workload on a fresh board and report per-operation timings.
+
+Recordings are made by setting BRAINSTORM_RECORD_DIR on the server: every
+board is recorded to ``<dir>/<access code>-<start time>.jsonl.gz`` until the
+process exits. The replay starts from the board state and RNG state the
+recording started from, and checks that it ends in the recorded state.
+
+    python -m benchmarks.replay recordings/ABC123-1760000000.jsonl.gz
+    python -m benchmarks.replay recording.jsonl.gz --speed 1    # original pacing
+    python -m benchmarks.replay recording.jsonl.gz --speed 10   # 10x faster
+"""
+
+import argparse
+import json
+import sys
+
+from brainstorm.workload import load, replay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("recording")
+    parser.add_argument(
+        "--speed", type=float, help="keep the recorded spacing, divided by this; default: no pauses"
+    )
+    parser.add_argument("--output", help="save the timings as JSON")
+    args = parser.parse_args()
+
+    recording = load(args.recording)
+    report = replay(recording, args.speed)
+    summary = report.summary()
+
+    print(f"{len(recording.calls)} calls replayed")
+    print(f"{'operation':<16} {'count':>7} {'total ms':>10} {'p50 us':>9} {'p99 us':>9}")
+    for operation, stats in summary.items():
+        print(
+            f"{operation:<16} {stats['count']:>7} {stats['total_ms']:>10.1f} "
+            f"{stats['p50_us']:>9.1f} {stats['p99_us']:>9.1f}"
+        )
+    if report.mismatches:
+        print(f"{report.mismatches} calls ended differently than when recorded")
+    if report.verified is None:
+        print("recording was not closed: final state not checked")
+    else:
+        print(f"final state {'matches' if report.verified else 'DIFFERS from'} the recording")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"operations": summary, "verified": report.verified}, file, indent=2)
+    if report.verified is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Load benchmark: /api/board read throughput against the number of worker processes.
+
+Starts owner.py and gunicorn with N workers (BRAINSTORM_OWNER_SOCKET mode),
+fills the board with notes through the API, then hammers GET /api/board from
+several client processes for a fixed time. Needs gunicorn
+(``pip install gunicorn``); the speed-up is bounded by the number of cores.
+
+    python -m benchmarks.workers
+"""
+
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from brainstorm.domain import MAX_NOTES_PER_PARTICIPANT
+
+WORKERS = [1, 2, 4]
+NOTES = 1_000
+CLIENTS = 8
+DURATION = 5.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(port: int, method: str, path: str, code: str = "", payload=None) -> bytes:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"X-Access-Code": code, "Content-Type": "application/json"}
+        connection.request(method, path, body=body, headers=headers)
+        return connection.getresponse().read()
+    finally:
+        connection.close()
+
+
+def _wait_for_port(port: int) -> None:
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def _fill(port: int, code: str) -> None:
+    for i in range(NOTES):
+        author = f"author-{i // MAX_NOTES_PER_PARTICIPANT}"
+        if i % MAX_NOTES_PER_PARTICIPANT == 0:
+            _request(port, "POST", "/api/join", code, {"name": author, "is_organizer": False})
+        note = {"name": author, "text": f"idea {i}", "x": i % 40 * 50, "y": i // 40 * 50}
+        _request(port, "POST", "/api/stickies", code, note)
+
+
+def _client(port: int, code: str, results: "multiprocessing.Queue[int]") -> None:
+    count = 0
+    deadline = time.monotonic() + DURATION
+    while time.monotonic() < deadline:
+        _request(port, "GET", "/api/board", code)
+        count += 1
+    results.put(count)
+
+
+def measure(workers: int) -> float:
+    """Requests per second served by ``workers`` worker processes."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        owner_socket = os.path.join(directory, "owner.sock")
+        owner = subprocess.Popen(
+            [sys.executable, "owner.py", owner_socket],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        processes: List[subprocess.Popen] = [owner]
+        try:
+            while not os.path.exists(owner_socket):
+                time.sleep(0.1)
+            env = {**os.environ, "BRAINSTORM_OWNER_SOCKET": owner_socket}
+            gunicorn = [sys.executable, "-m", "gunicorn", "-w", str(workers)]
+            processes.append(
+                subprocess.Popen(
+                    [*gunicorn, "-b", f"127.0.0.1:{port}", "app:app"],
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            )
+            _wait_for_port(port)
+            page = _request(port, "GET", "/").decode()
+            code = page.split('id="current-access-code">', 1)[1][:6]
+            _fill(port, code)
+
+            results: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+            clients = [
+                multiprocessing.Process(target=_client, args=(port, code, results))
+                for _ in range(CLIENTS)
+            ]
+            for client in clients:
+                client.start()
+            total = sum(results.get() for _ in clients)
+            for client in clients:
+                client.join()
+            return total / DURATION
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait()
+
+
+def main() -> None:
+    print(f"cores available: {len(os.sched_getaffinity(0))}")
+    print(f"{'workers':>8}  {'GET /api/board per s':>20}")
+    for workers in WORKERS:
+        print(f"{workers:>8}  {measure(workers):>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Content-Encoding negotiation for JSON responses.
+
+gzip is always available; zstd and brotli are offered when the optional
+``zstandard`` or ``brotli`` packages are installed. Bodies below
+``MIN_COMPRESSED_SIZE`` are sent as they are: a few hundred bytes gain little
+and still cost a compressor run.
+"""
+
+import gzip
+from typing import Callable, Dict
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESSED_SIZE = 1024
+
+# In order of preference when the client accepts several with equal quality.
+# Levels favour speed: a body is compressed once per board version, but that
+# still happens on the request path right after every mutation.
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = lambda data: zstandard.compress(data, 3)
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=5)
+COMPRESSORS["gzip"] = lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return COMPRESSORS[encoding](body)
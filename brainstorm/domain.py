@@ -1,10 +1,35 @@
+import functools
 import random
 import string
+import sys
+import threading
+import time
 import uuid
-from dataclasses import dataclass
-from datetime import datetime
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Dict, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from brainstorm.spatial import GridIndex, GridSnapshot
+
+T = TypeVar("T")
+Viewport = Tuple[float, float, float, float]
+# Ranking order: highest score first, then the earliest note, then the id.
+RankKey = Tuple[int, float, str]
 
 
 class NameAlreadyExists(Exception):
@@ -49,19 +74,29 @@ class Phase(str, Enum):
     FINISHED = "FINISHED"
 
 
-COLORS = ["#fff59d", "#ffe082", "#ffcc80", "#c5e1a5", "#fff176", "#ffd180"]
+COLORS = [
+    sys.intern(color)
+    for color in ("#fff59d", "#ffe082", "#ffcc80", "#c5e1a5", "#fff176", "#ffd180")
+]
 MAX_NOTE_LENGTH = 200
 MAX_NOTES_PER_PARTICIPANT = 50
+MAX_EVENTS = 1000
+DRAG_TIMEOUT = 5.0
 
 
-@dataclass
+# Entities are slotted and immutable: a board can hold thousands of them, and
+# snapshots share them instead of copying. Names and colours are interned so
+# every note of an author points at the same string objects.
+
+
+@dataclass(frozen=True, slots=True)
 class Participant:
     name: str
     is_organizer: bool
     color: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Note:
     id: str
     text: str
@@ -69,35 +104,336 @@ class Note:
     color: str
     x: float
     y: float
-    created_at: datetime
+    created_at: float  # Unix timestamp (UTC), formatted only when serialized.
+
+
+@dataclass
+class Event:
+    version: int
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class NoteDraft:
+    """A note to import, before the board gives it an id, colour and timestamp."""
+
+    author_name: str
+    text: str
+    x: float
+    y: float
+
+
+@dataclass(frozen=True)
+class MoveNote:
+    note_id: str
+    x: float
+    y: float
+
+
+@dataclass(frozen=True)
+class DeleteNote:
+    note_id: str
+    requester: str
+
+
+@dataclass(frozen=True)
+class SetVote:
+    participant_name: str
+    note_id: str
+    points: int
+
+
+Command = Union[MoveNote, DeleteNote, SetVote]
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    version: int
+    phase: Phase
+    participants: Tuple[Participant, ...]
+    notes: Tuple[Note, ...]
+    votes_by_note: Dict[str, Dict[str, int]]
+    scores: Dict[str, int]
+    spent_points: Dict[str, int]
+    access_code: str
+
+
+@dataclass(frozen=True)
+class _Published:
+    """The board as of its last completed mutation, read by lock-free readers.
+
+    Built by ``Board._publish`` and never changed afterwards: the containers
+    are copies, or share inner dicts the board replaces instead of updating.
+    """
+
+    version: int
+    phase: Phase
+    access_code: str
+    participants: Tuple[Participant, ...]
+    notes: Dict[str, Note]
+    votes_by_note: Dict[str, Dict[str, int]]
+    scores: Dict[str, int]
+    spent_points: Dict[str, int]
+    ranking: Tuple[RankKey, ...]
+    spatial: GridSnapshot
+    events: Tuple[Event, ...]
+
+
+CallRecorder = Callable[[str, Tuple[Any, ...], Dict[str, Any], Optional[BaseException]], None]
+
+
+def _writer(method: Callable[..., T]) -> Callable[..., T]:
+    """Run a Board mutation under the board lock, then publish the result to readers.
+
+    Outermost calls publish the new state and wake waiters once the whole
+    mutation is done, and are reported to ``Board.operation_observer`` and to
+    the board's ``call_recorder`` when they are set.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "Board", *args: Any, **kwargs: Any) -> T:
+        observer = Board.operation_observer if self.reports_operations else None
+        recorder = self.call_recorder
+        start = time.perf_counter() if observer is not None else 0.0
+        error: Optional[BaseException] = None
+        with self._changed:
+            if self._writing:
+                # Nested call from another mutation on this thread.
+                return method(self, *args, **kwargs)
+            self._writing = True
+            version = self.version
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                self._writing = False
+                # A rejected call normally changed nothing; skip the copy then.
+                if error is None or self.version != version:
+                    self._publish()
+                if self.version != version:
+                    self._notify()
+                if observer is not None:
+                    observer(name, time.perf_counter() - start, error)
+                if recorder is not None:
+                    # Still under the lock, so writes are recorded in the order applied.
+                    recorder(name, args, kwargs, error)
+
+    return wrapper
+
+
+def _recorded(method: Callable[..., T]) -> Callable[..., T]:
+    """Report calls of a lock-free Board method to the board's ``call_recorder``."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "Board", *args: Any, **kwargs: Any) -> T:
+        recorder = self.call_recorder
+        if recorder is None:
+            return method(self, *args, **kwargs)
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception as exc:
+            recorder(name, args, kwargs, exc)
+            raise
+        recorder(name, args, kwargs, None)
+        return result
+
+    return wrapper
 
 
 class Board:
+    """A brainstorming board.
+
+    Mutations are serialized by a per-board lock. Readers never take it: each
+    completed mutation publishes an immutable ``_Published`` state, and readers
+    load the latest one. Notes and participants are immutable, so published
+    states and snapshots share them.
+    """
+
+    # Called as observer(operation, seconds, exception or None) after every
+    # mutation, on all boards; used for metrics.
+    operation_observer: Optional[Callable[[str, float, Optional[BaseException]], None]] = None
+
     def __init__(self, rng: Optional[random.Random] = None):
         self.rng = rng or random.Random()
+        # False on a board whose mutations are not client operations (a
+        # replica mirroring the owner): operation_observer does not see them.
+        self.reports_operations = True
+        # Called as recorder(operation, args, kwargs, exception or None) after
+        # each API-facing call on this board; see brainstorm.workload.
+        self.call_recorder: Optional[CallRecorder] = None
         self.phase = Phase.GENERATING
         self.participants: Dict[str, Participant] = {}
         self.notes: Dict[str, Note] = {}
+        self.notes_by_author: Dict[str, Set[str]] = {}
+        self.spatial = GridIndex()
         self.votes: Dict[str, Dict[str, int]] = {}
+        # Indexes derived from ``votes``, kept in step by set_vote/delete_note/reset.
+        self.votes_by_note: Dict[str, Dict[str, int]] = {}
+        self.scores: Dict[str, int] = {}
+        self.spent_points: Dict[str, int] = {}
+        # Every note's RankKey, kept sorted; see top().
+        self.ranking: List[RankKey] = []
+        # Uncommitted drag positions: note id -> (x, y, monotonic time of last update).
+        self.drag_positions: Dict[str, Tuple[float, float, float]] = {}
+        self.drag_seq = 0
         self.access_code = self._generate_access_code()
+        self.version = 0
+        self.events: Deque[Event] = deque(maxlen=MAX_EVENTS)
+        self._changed = threading.Condition(threading.RLock())
+        # Called (under the lock) whenever waiters are woken; lets event loops
+        # wait for changes without parking a thread in wait_for_change.
+        self._listeners: List[Callable[[], None]] = []
+        # True while the outermost mutation runs; nested ones neither publish nor notify.
+        self._writing = False
+        self._publish()
 
     def _generate_access_code(self, length: int = 6) -> str:
         alphabet = string.ascii_uppercase + string.digits
         return "".join(self.rng.choice(alphabet) for _ in range(length))
 
-    def _require_organizer(self, name: str) -> None:
+    def _record(self, kind: str, **data: Any) -> None:
+        # Only called by mutations: _writer wakes waiters once they are done.
+        self.version += 1
+        self.events.append(Event(version=self.version, kind=kind, data=data))
+
+    def _publish(self) -> None:
+        # One attribute assignment, so a reader sees the old state or the new one.
+        # dict.copy() rather than dict(): it stays a block copy after deletions.
+        self._published = _Published(
+            version=self.version,
+            phase=self.phase,
+            access_code=self.access_code,
+            participants=tuple(self.participants.values()),
+            notes=self.notes.copy(),
+            votes_by_note=self.votes_by_note.copy(),
+            scores=self.scores.copy(),
+            spent_points=self.spent_points.copy(),
+            ranking=tuple(self.ranking),
+            spatial=self.spatial.snapshot(),
+            events=tuple(self.events),
+        )
+
+    def _notify(self) -> None:
+        self._changed.notify_all()
+        for listener in self._listeners:
+            listener()
+
+    def start_recording(self, recorder: CallRecorder) -> Tuple[BoardSnapshot, Any]:
+        """Install ``recorder`` as ``call_recorder``; return the board's state
+        (snapshot, RNG state) right before the first call it will see."""
+        with self._changed:
+            self.call_recorder = recorder
+            return self._snapshot(self._published, None), self.rng.getstate()
+
+    def stop_recording(self) -> BoardSnapshot:
+        """Remove ``call_recorder``; return the state after the last call it saw."""
+        with self._changed:
+            self.call_recorder = None
+            return self._snapshot(self._published, None)
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call ``listener`` after every change that wakes ``wait_for_change``.
+
+        Listeners run on the writing thread with the board lock held, so they
+        must only hand the notification off (e.g. ``loop.call_soon_threadsafe``).
+        """
+        with self._changed:
+            self._listeners = [*self._listeners, listener]
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        with self._changed:
+            self._listeners = [item for item in self._listeners if item is not listener]
+
+    def wait_for_change(
+        self, version: int, timeout: float, drag_seq: Optional[int] = None
+    ) -> bool:
+        """Block until the board moves past ``version``; False on timeout.
+
+        With ``drag_seq``, also wake up when live drag positions start moving.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.version != version
+                or (drag_seq is not None and self.drag_seq != drag_seq),
+                timeout,
+            )
+
+    @_recorded
+    def snapshot(self, viewport: Optional[Viewport] = None) -> BoardSnapshot:
+        """Consistent copy of the board; with ``viewport``, only the notes inside it."""
+        return self._snapshot(self._published, viewport)
+
+    @staticmethod
+    def _snapshot(state: _Published, viewport: Optional[Viewport]) -> BoardSnapshot:
+        if viewport is None:
+            notes = tuple(state.notes.values())
+            votes_by_note = {
+                note_id: dict(voters) for note_id, voters in state.votes_by_note.items()
+            }
+            scores = dict(state.scores)
+        else:
+            notes = tuple(Board._notes_in(state, viewport))
+            votes_by_note = {
+                note.id: dict(state.votes_by_note[note.id])
+                for note in notes
+                if note.id in state.votes_by_note
+            }
+            scores = {note.id: state.scores[note.id] for note in notes}
+        return BoardSnapshot(
+            version=state.version,
+            phase=state.phase,
+            participants=state.participants,
+            notes=notes,
+            votes_by_note=votes_by_note,
+            scores=scores,
+            spent_points=dict(state.spent_points),
+            access_code=state.access_code,
+        )
+
+    @staticmethod
+    def _notes_in(state: _Published, viewport: Viewport) -> Iterator[Note]:
+        x0, y0, x1, y1 = viewport
+        for note_id in state.spatial.query(x0, y0, x1, y1):
+            note = state.notes[note_id]
+            if x0 <= note.x <= x1 and y0 <= note.y <= y1:
+                yield note
+
+    @_recorded
+    def changes_since(self, version: int) -> Optional[List[Event]]:
+        """Return events newer than ``version``, or None if they are no longer kept."""
+        state = self._published
+        if version > state.version:
+            return None
+        if version == state.version:
+            return []
+        events = state.events
+        if not events or version < events[0].version - 1:
+            return None
+        return list(events[version - events[0].version + 1 :])
+
+    def require_organizer(self, name: str) -> None:
         participant = self.participants.get(name)
         if not participant or not participant.is_organizer:
             raise NotOrganizer()
 
+    @_writer
     def join(self, name: str, is_organizer: bool) -> Participant:
         if name in self.participants:
             raise NameAlreadyExists()
         color = self.rng.choice(COLORS)
-        participant = Participant(name=name, is_organizer=is_organizer, color=color)
+        participant = Participant(
+            name=sys.intern(name), is_organizer=is_organizer, color=color
+        )
         self.participants[name] = participant
+        self._record("participant_joined", participant=participant)
         return participant
 
+    @_writer
     def add_note(self, author_name: str, text: str, x: float, y: float) -> Note:
         if self.phase is not Phase.GENERATING:
             raise ForbiddenInPhase()
@@ -106,47 +442,170 @@ class Board:
             raise NotFound()
         if len(text) > MAX_NOTE_LENGTH:
             raise NoteTextTooLong()
-        author_note_count = sum(
-            1 for note in self.notes.values() if note.author_name == author_name
-        )
-        if author_note_count >= MAX_NOTES_PER_PARTICIPANT:
+        if len(self.notes_by_author.get(author.name, ())) >= MAX_NOTES_PER_PARTICIPANT:
             raise StickyLimitExceeded()
-        note_id = str(uuid.UUID(int=self.rng.getrandbits(128)))
+        return self._add_note(author, text, x, y)
+
+    def _add_note(self, author: Participant, text: str, x: float, y: float) -> Note:
         note = Note(
-            id=note_id,
+            id=str(uuid.UUID(int=self.rng.getrandbits(128))),
             text=text,
             author_name=author.name,
             color=author.color,
             x=x,
             y=y,
-            created_at=datetime.utcnow(),
+            created_at=time.time(),
         )
-        self.notes[note_id] = note
+        self._insert_note(note)
+        self._record("note_added", note=note)
         return note
 
-    def move_note(self, note_id: str, x: float, y: float) -> None:
-        if self.phase is Phase.FINISHED:
+    @_writer
+    def import_notes(
+        self, requester: str, drafts: Sequence[NoteDraft]
+    ) -> Tuple[int, List[Tuple[int, Exception]]]:
+        """Add ``drafts`` in one pass under a single lock acquisition.
+
+        Every draft is checked before any is added. Drafts by someone not on
+        the board, or breaking the text or per-participant limits, are skipped,
+        not fatal: returns the number of notes added and ``(index, error)``
+        for each rejected draft.
+        """
+        self.require_organizer(requester)
+        if self.phase is not Phase.GENERATING:
             raise ForbiddenInPhase()
-        note = self.notes.get(note_id)
-        if not note:
-            raise NotFound()
-        note.x = x
-        note.y = y
-
-    def delete_note(self, note_id: str, requester: str) -> None:
+        accepted: List[Tuple[Participant, NoteDraft]] = []
+        rejected: List[Tuple[int, Exception]] = []
+        note_counts: Dict[str, int] = {}
+        for index, draft in enumerate(drafts):
+            author = self.participants.get(draft.author_name)
+            if author is None:
+                rejected.append((index, NotFound()))
+                continue
+            if len(draft.text) > MAX_NOTE_LENGTH:
+                rejected.append((index, NoteTextTooLong()))
+                continue
+            count = note_counts.get(author.name, len(self.notes_by_author.get(author.name, ())))
+            if count >= MAX_NOTES_PER_PARTICIPANT:
+                rejected.append((index, StickyLimitExceeded()))
+                continue
+            note_counts[author.name] = count + 1
+            accepted.append((author, draft))
+        for author, draft in accepted:
+            self._add_note(author, draft.text, draft.x, draft.y)
+        return len(accepted), rejected
+
+    def _insert_note(self, note: Note) -> None:
+        # The spatial index goes first: it is the step that can fail.
+        self.spatial.insert(note.id, note.x, note.y)
+        self.notes[note.id] = note
+        self.notes_by_author.setdefault(note.author_name, set()).add(note.id)
+        self.scores[note.id] = 0
+        insort(self.ranking, self._rank_key(note.id))
+
+    def _rank_key(self, note_id: str) -> RankKey:
+        return (-self.scores[note_id], self.notes[note_id].created_at, note_id)
+
+    def _unrank(self, note_id: str) -> None:
+        del self.ranking[bisect_left(self.ranking, self._rank_key(note_id))]
+
+    def _check_note_editable(self, note_id: str) -> Note:
         if self.phase is Phase.FINISHED:
             raise ForbiddenInPhase()
         note = self.notes.get(note_id)
         if not note:
             raise NotFound()
+        return note
+
+    def _check_deletable(self, note_id: str, requester: str) -> None:
+        note = self._check_note_editable(note_id)
         if note.author_name != requester:
             raise NotAuthor()
-        del self.notes[note_id]
-        for allocations in self.votes.values():
-            allocations.pop(note_id, None)
 
+    @_writer
+    def move_note(self, note_id: str, x: float, y: float) -> None:
+        self._check_note_editable(note_id)
+        self._move_note(note_id, x, y)
+
+    def _move_note(self, note_id: str, x: float, y: float) -> None:
+        self.spatial.move(note_id, x, y)
+        self.notes[note_id] = replace(self.notes[note_id], x=x, y=y)
+        self._end_drag(note_id)
+        self._record("note_moved", note_id=note_id, x=x, y=y)
+
+    @_recorded
+    def drag_note(self, note_id: str, x: float, y: float) -> None:
+        """Record an in-progress drag position without committing it.
+
+        Only the latest position per note is kept. Drags bump ``drag_seq``
+        rather than the version, and end when the note is moved for real or
+        after DRAG_TIMEOUT seconds without an update.
+        """
+        # Under the lock, so a concurrent delete cannot leave a live drag for
+        # a note that is gone and no drag_seq increment is lost. Nothing
+        # published to readers changes, so this is not a _writer.
+        with self._changed:
+            self._check_note_editable(note_id)
+            started = not self.drag_positions
+            self.drag_positions[note_id] = (x, y, time.monotonic())
+            self.drag_seq += 1
+            if started:
+                self._notify()
+
+    def live_positions(self) -> Dict[str, Tuple[float, float]]:
+        """Current drag positions, dropping drags that went quiet."""
+        cutoff = time.monotonic() - DRAG_TIMEOUT
+        positions = {}
+        quiet = []
+        for note_id, (x, y, updated_at) in list(self.drag_positions.items()):
+            if updated_at < cutoff:
+                quiet.append(note_id)
+            else:
+                positions[note_id] = (x, y)
+        if quiet:
+            with self._changed:
+                for note_id in quiet:
+                    # The drag may have been updated or ended since we looked.
+                    entry = self.drag_positions.get(note_id)
+                    if entry is not None and entry[2] < cutoff:
+                        self._end_drag(note_id)
+        return positions
+
+    def mirror_drags(self, positions: Dict[str, Tuple[float, float]]) -> None:
+        """Replace the live drag positions with those of another copy of this board."""
+        now = time.monotonic()
+        with self._changed:
+            self.drag_positions = {
+                note_id: (x, y, now) for note_id, (x, y) in positions.items()
+            }
+            self.drag_seq += 1
+            self._notify()
+
+    def _end_drag(self, note_id: str) -> None:
+        if self.drag_positions.pop(note_id, None) is not None:
+            self.drag_seq += 1
+
+    @_writer
+    def delete_note(self, note_id: str, requester: str) -> None:
+        self._check_deletable(note_id, requester)
+        self._delete_note(note_id)
+
+    def _delete_note(self, note_id: str) -> None:
+        self._unrank(note_id)
+        note = self.notes.pop(note_id)
+        self.spatial.remove(note_id)
+        self._end_drag(note_id)
+        self.notes_by_author[note.author_name].discard(note_id)
+        del self.scores[note_id]
+        refunded = self.votes_by_note.pop(note_id, {})
+        for voter, points in refunded.items():
+            del self.votes[voter][note_id]
+            self.spent_points[voter] -= points
+        self._record("note_deleted", note_id=note_id, refunded=refunded)
+
+    @_writer
     def change_phase(self, requester: str, new_phase: Phase) -> None:
-        self._require_organizer(requester)
+        self.require_organizer(requester)
         if new_phase == self.phase:
             return
         allowed = {
@@ -156,8 +615,9 @@ class Board:
         if allowed.get(self.phase) != new_phase:
             raise InvalidPhaseTransition()
         self.phase = new_phase
+        self._record("phase_changed", phase=new_phase)
 
-    def set_vote(self, participant_name: str, note_id: str, points: int) -> None:
+    def _check_vote(self, participant_name: str, note_id: str, points: int) -> None:
         if self.phase is not Phase.VOTING:
             raise ForbiddenInPhase()
         if points < 0 or points > 5:
@@ -167,19 +627,175 @@ class Board:
             raise NotFound()
         if note_id not in self.notes:
             raise NotFound()
-        allocations = self.votes.setdefault(participant_name, {})
-        current_total = sum(allocations.values()) - allocations.get(note_id, 0)
-        if current_total + points > 5:
+
+    @_writer
+    def set_vote(self, participant_name: str, note_id: str, points: int) -> None:
+        self._check_vote(participant_name, note_id, points)
+        previous = self.votes.get(participant_name, {}).get(note_id, 0)
+        if self.spent_points.get(participant_name, 0) - previous + points > 5:
             raise VoteLimitExceeded()
+        self._set_vote(participant_name, note_id, points)
+
+    def _set_vote(self, participant_name: str, note_id: str, points: int) -> None:
+        allocations = self.votes.setdefault(participant_name, {})
+        previous = allocations.get(note_id, 0)
         allocations[note_id] = points
+        # Replaced, not updated: published states share these dicts.
+        self.votes_by_note[note_id] = {
+            **self.votes_by_note.get(note_id, {}),
+            participant_name: points,
+        }
+        self.spent_points[participant_name] = (
+            self.spent_points.get(participant_name, 0) - previous + points
+        )
+        self._unrank(note_id)
+        self.scores[note_id] += points - previous
+        insort(self.ranking, self._rank_key(note_id))
+        self._record(
+            "vote_set",
+            participant_name=participant_name,
+            note_id=note_id,
+            points=points,
+            score=self.scores[note_id],
+            spent=self.spent_points[participant_name],
+        )
+
+    @_writer
+    def apply_batch(self, commands: List[Command]) -> int:
+        """Validate ``commands`` together, apply all of them or none, return the version.
+
+        Vote budgets are checked against the allocations the batch ends with, so
+        points can be moved from one note to another in a single batch.
+        """
+        deleted: Set[str] = set()
+        allocations: Dict[str, Dict[str, int]] = {}
+        for command in commands:
+            if command.note_id in deleted:
+                raise NotFound()
+            if isinstance(command, MoveNote):
+                self._check_note_editable(command.note_id)
+            elif isinstance(command, DeleteNote):
+                self._check_deletable(command.note_id, command.requester)
+                deleted.add(command.note_id)
+            elif isinstance(command, SetVote):
+                name = command.participant_name
+                self._check_vote(name, command.note_id, command.points)
+                if name not in allocations:
+                    allocations[name] = dict(self.votes.get(name, {}))
+                allocations[name][command.note_id] = command.points
+            else:
+                raise TypeError(f"unsupported command: {command!r}")
+        for own in allocations.values():
+            if sum(points for note_id, points in own.items() if note_id not in deleted) > 5:
+                raise VoteLimitExceeded()
+
+        for command in commands:
+            if isinstance(command, MoveNote):
+                self._move_note(command.note_id, command.x, command.y)
+            elif isinstance(command, DeleteNote):
+                self._delete_note(command.note_id)
+            else:
+                self._set_vote(command.participant_name, command.note_id, command.points)
+        return self.version
+
+    @_recorded
+    def top(self, limit: int) -> List[Tuple[Note, int]]:
+        """The ``limit`` best-scored notes with their scores, ties going to older notes."""
+        state = self._published
+        return [
+            (state.notes[note_id], -negated_score)
+            for negated_score, _, note_id in state.ranking[:limit]
+        ]
+
+    @_recorded
+    def scored_notes(self) -> Iterator[Tuple[Note, int]]:
+        """Every note with its score, in creation order, read consistently.
+
+        Two flat tuples are copied rather than a pair per note, so a large
+        board costs two pointers per note until the iterator is consumed.
+        """
+        state = self._published
+        notes = tuple(state.notes.values())
+        return zip(notes, tuple(map(state.scores.__getitem__, state.notes)))
 
     def note_score(self, note_id: str) -> int:
-        return sum(votes.get(note_id, 0) for votes in self.votes.values())
+        return self._published.scores.get(note_id, 0)
 
+    @_writer
     def reset(self, requester: str) -> None:
-        self._require_organizer(requester)
+        self.require_organizer(requester)
+        self._clear()
+        self.access_code = self._generate_access_code()
+        self._record("reset", access_code=self.access_code)
+
+    def _clear(self) -> None:
         self.phase = Phase.GENERATING
         self.participants.clear()
         self.notes.clear()
+        self.notes_by_author.clear()
+        self.spatial.clear()
         self.votes.clear()
-        self.access_code = self._generate_access_code()
+        self.votes_by_note.clear()
+        self.scores.clear()
+        self.spent_points.clear()
+        self.ranking.clear()
+        if self.drag_positions:
+            self.drag_positions.clear()
+            self.drag_seq += 1
+
+    @_writer
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """Replace the whole board with ``snapshot``, e.g. one loaded from disk.
+
+        Indexes are rebuilt from the notes and votes; the event log starts
+        empty at the snapshot's version.
+        """
+        self._clear()
+        self.access_code = snapshot.access_code
+        self.phase = snapshot.phase
+        for participant in snapshot.participants:
+            self.participants[participant.name] = participant
+        for note in snapshot.notes:
+            self._insert_note(note)
+        for note_id, voters in snapshot.votes_by_note.items():
+            self.votes_by_note[note_id] = dict(voters)
+            for voter, points in voters.items():
+                self.votes.setdefault(voter, {})[note_id] = points
+                self.spent_points[voter] = self.spent_points.get(voter, 0) + points
+                self.scores[note_id] += points
+        self.ranking[:] = sorted(self._rank_key(note_id) for note_id in self.notes)
+        self.events.clear()
+        self.version = snapshot.version
+
+    @_writer
+    def replay(self, event: Event) -> None:
+        """Re-apply a recorded event, recording it again under the same version.
+
+        Events are replayed without validation: they were checked when first
+        applied. They must follow the current version without gaps.
+        """
+        if event.version != self.version + 1:
+            raise ValueError(f"expected version {self.version + 1}, got {event.version}")
+        data = event.data
+        if event.kind == "participant_joined":
+            participant = data["participant"]
+            self.participants[participant.name] = participant
+            self._record(event.kind, **data)
+        elif event.kind == "note_added":
+            self._insert_note(data["note"])
+            self._record(event.kind, **data)
+        elif event.kind == "note_moved":
+            self._move_note(data["note_id"], data["x"], data["y"])
+        elif event.kind == "note_deleted":
+            self._delete_note(data["note_id"])
+        elif event.kind == "vote_set":
+            self._set_vote(data["participant_name"], data["note_id"], data["points"])
+        elif event.kind == "phase_changed":
+            self.phase = data["phase"]
+            self._record(event.kind, **data)
+        elif event.kind == "reset":
+            self._clear()
+            self.access_code = data["access_code"]
+            self._record(event.kind, **data)
+        else:
+            raise ValueError(f"unknown event kind: {event.kind}")
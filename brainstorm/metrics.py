@@ -0,0 +1,118 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Only fixed-bucket histograms are kept: observing a value is a bisect and two
+additions under a lock, so recording every request and every Board operation
+costs about a microsecond.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[object, ...]
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152)
+
+
+class Histogram:
+    """A family of histograms sharing a name and buckets, one per label set.
+
+    Series are keyed by the tuple of label values, in ``label_names`` order.
+    """
+
+    def __init__(
+        self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (the last one is +Inf), sum]
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in sorted(self._series.items())
+            ]
+        for values, counts, total in series:
+            labels = list(zip(self.label_names, values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(labels, le=bound)} {cumulative}"
+            yield f"{self.name}_sum{_labels(labels)} {total}"
+            yield f"{self.name}_count{_labels(labels)} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: List[Tuple[str, object]], le: Optional[object] = None) -> str:
+    pairs = [f'{key}="{_escape(str(value))}"' for key, value in labels]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metrics:
+    """HTTP and Board operation metrics for one process."""
+
+    def __init__(self) -> None:
+        self.request_duration = Histogram(
+            "brainstorm_http_request_duration_seconds",
+            "Request latency by route, method and status; _count is the request count.",
+            ("route", "method", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "brainstorm_http_response_size_bytes",
+            "Response body size by route and method.",
+            ("route", "method"),
+            SIZE_BUCKETS,
+        )
+        self.operation_duration = Histogram(
+            "brainstorm_operation_duration_seconds",
+            'Board operation latency by operation and raised exception ("none" on success).',
+            ("operation", "error"),
+            LATENCY_BUCKETS,
+        )
+
+    def observe_request(
+        self, route: str, method: str, status: int, seconds: float, size: Optional[int]
+    ) -> None:
+        self.request_duration.observe((route, method, status), seconds)
+        if size is not None:
+            self.response_size.observe((route, method), size)
+
+    def observe_operation(
+        self, operation: str, seconds: float, error: Optional[BaseException]
+    ) -> None:
+        outcome = "none" if error is None else type(error).__name__
+        self.operation_duration.observe((operation, outcome), seconds)
+
+    def render(self, gauges: Dict[str, Tuple[str, float]]) -> str:
+        """Exposition text; ``gauges`` maps a metric name to (help text, value)."""
+        lines: List[str] = []
+        for name, (help_text, value) in gauges.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        for histogram in (self.request_duration, self.response_size, self.operation_duration):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
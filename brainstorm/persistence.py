@@ -0,0 +1,231 @@
+"""Optional on-disk persistence for boards.
+
+Each persisted board owns a directory holding ``snapshot.json`` (the whole
+board at some version) and ``journal.jsonl`` (one line per event after it).
+A ``Journal`` appends the events a board records and fsyncs them in groups
+from a background thread, so requests never wait for the disk. The price is
+that a request is answered before its events are on disk: a crash loses
+every event not yet fsynced, acknowledged or not, which is whatever was
+queued or being written at the time. Restoring loads the snapshot and
+replays the journal tail.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from brainstorm.domain import Board, BoardSnapshot, Event, Note, Participant, Phase
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.jsonl"
+# The journal is folded into a fresh snapshot after this many events.
+SNAPSHOT_EVERY = 5_000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (Note, Participant)):
+        return asdict(value)
+    if isinstance(value, Phase):
+        return value.value
+    return value
+
+
+def _participant(data: Dict[str, Any]) -> Participant:
+    return Participant(
+        name=sys.intern(data["name"]),
+        is_organizer=data["is_organizer"],
+        color=sys.intern(data["color"]),
+    )
+
+
+def _note(data: Dict[str, Any]) -> Note:
+    return Note(
+        id=data["id"],
+        text=data["text"],
+        author_name=sys.intern(data["author_name"]),
+        color=sys.intern(data["color"]),
+        x=data["x"],
+        y=data["y"],
+        created_at=data["created_at"],
+    )
+
+
+def encode_event(event: Event) -> str:
+    data = {key: _encode_value(value) for key, value in event.data.items()}
+    return json.dumps({"version": event.version, "kind": event.kind, "data": data})
+
+
+def decode_event(line: str) -> Event:
+    raw = json.loads(line)
+    data = raw["data"]
+    if "participant" in data:
+        data["participant"] = _participant(data["participant"])
+    if "note" in data:
+        data["note"] = _note(data["note"])
+    if "phase" in data:
+        data["phase"] = Phase(data["phase"])
+    return Event(version=raw["version"], kind=raw["kind"], data=data)
+
+
+def encode_snapshot(snapshot: BoardSnapshot) -> str:
+    return json.dumps(
+        {
+            "version": snapshot.version,
+            "phase": snapshot.phase.value,
+            "access_code": snapshot.access_code,
+            "participants": [asdict(participant) for participant in snapshot.participants],
+            "notes": [asdict(note) for note in snapshot.notes],
+            "votes": snapshot.votes_by_note,
+        }
+    )
+
+
+def decode_snapshot(text: str) -> BoardSnapshot:
+    raw = json.loads(text)
+    # Scores and spent points are derived; Board.restore rebuilds them.
+    return BoardSnapshot(
+        version=raw["version"],
+        phase=Phase(raw["phase"]),
+        participants=tuple(_participant(item) for item in raw["participants"]),
+        notes=tuple(_note(item) for item in raw["notes"]),
+        votes_by_note=raw["votes"],
+        scores={},
+        spent_points={},
+        access_code=raw["access_code"],
+    )
+
+
+def restore_board(directory: str) -> Board:
+    """Rebuild a board from ``directory``; an empty or missing one gives a new board."""
+    board = Board()
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, encoding="utf-8") as snapshot_file:
+            board.restore(decode_snapshot(snapshot_file.read()))
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    if os.path.exists(journal_path):
+        with open(journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    event = decode_event(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write.
+                    break
+                # Lines up to the snapshot's version may survive a crash
+                # between writing the snapshot and truncating the journal.
+                if event.version > board.version:
+                    board.replay(event)
+    return board
+
+
+def _fsync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """Persists everything ``board`` records to ``directory``.
+
+    The board listener only queues events; a background thread writes every
+    queued event and fsyncs once per group. Snapshotting starts immediately,
+    which compacts whatever journal the board was restored from.
+    """
+
+    def __init__(self, board: Board, directory: str, snapshot_every: int = SNAPSHOT_EVERY):
+        os.makedirs(directory, exist_ok=True)
+        self.board = board
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._file = open(os.path.join(directory, JOURNAL_FILE), "a", encoding="utf-8")
+        self._pending: List[Event] = []
+        self._queued = threading.Condition()
+        self._queued_version = self._durable_version = board.version
+        self._since_snapshot = 0
+        self._closed = False
+        board.add_listener(self._on_change)
+        # Events recorded meanwhile are queued and skipped on restore if the
+        # snapshot already has them.
+        self._write_snapshot()
+        self._thread = threading.Thread(target=self._run, name="board-journal", daemon=True)
+        self._thread.start()
+
+    def _on_change(self) -> None:
+        # Runs under the board lock right after _record, or after a drag
+        # starts (which records nothing).
+        event = self.board.events[-1] if self.board.events else None
+        if event is None or event.version <= self._queued_version:
+            return
+        with self._queued:
+            self._queued_version = event.version
+            self._pending.append(event)
+            self._queued.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._queued:
+                while not self._pending and not self._closed:
+                    self._queued.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+            self._file.write("".join(encode_event(event) + "\n" for event in batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._since_snapshot += len(batch)
+            if self._since_snapshot >= self.snapshot_every:
+                self._write_snapshot()
+            with self._queued:
+                self._durable_version = batch[-1].version
+                self._queued.notify_all()
+
+    def _write_snapshot(self) -> None:
+        snapshot = self.board.snapshot()
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as tmp:
+            tmp.write(encode_snapshot(snapshot))
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(path + ".tmp", path)
+        _fsync_directory(self.directory)
+        # Everything journaled so far is now in the snapshot; events recorded
+        # since are still queued and land in the emptied journal.
+        self._file.truncate(0)
+        os.fsync(self._file.fileno())
+        self._since_snapshot = 0
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event recorded so far is on disk."""
+        version = self.board.version
+        with self._queued:
+            return self._queued.wait_for(lambda: self._durable_version >= version, timeout)
+
+    def close(self) -> None:
+        """Stop journaling after writing out what is queued."""
+        self.board.remove_listener(self._on_change)
+        with self._queued:
+            self._closed = True
+            self._queued.notify_all()
+        self._thread.join()
+        self._file.close()
+
+
+def persist(board: Board, directory: str) -> Journal:
+    """Journal ``board`` to ``directory`` until the process exits."""
+    journal = Journal(board, directory)
+    # The writer thread is a daemon; write out its queue on a clean exit.
+    atexit.register(journal.close)
+    return journal
+
+
+def open_board(directory: str) -> Board:
+    """Restore the board kept in ``directory`` and keep journaling it there."""
+    board = restore_board(directory)
+    persist(board, directory)
+    return board
@@ -0,0 +1,68 @@
+"""Token buckets and an in-flight cap for shedding load before it reaches a board.
+
+A ``RateLimiter`` keeps one bucket per key (a participant, a board). Buckets
+that have been idle long enough to refill are forgotten, so keys made up by
+clients cannot grow the table without bound.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Tuple
+
+
+class RateLimiter:
+    """Allows ``rate`` requests per second per key, in bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens, time they were counted)
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._pruned_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for ``key``: 0.0 if granted, else seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, counted = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - counted) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._forget_full(now)
+            return 0.0
+
+    def _forget_full(self, now: float) -> None:
+        refill = self.burst / self.rate
+        # At most once per refill period: if every bucket is busy, pruning
+        # again on each call would only rebuild the same table.
+        if now - self._pruned_at < refill:
+            return
+        self._pruned_at = now
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if now - bucket[1] < refill
+        }
+
+
+class InFlightLimit:
+    """Counts requests being handled and refuses new ones past ``limit``."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
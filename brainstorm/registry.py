@@ -0,0 +1,54 @@
+import random
+import threading
+from typing import Dict, List, Optional
+
+from brainstorm.domain import Board
+
+
+class TooManyBoards(Exception):
+    pass
+
+
+class BoardRegistry:
+    """Independent boards looked up by their current access code.
+
+    Lookups are plain dict reads; the registry lock is only taken to add or
+    re-key a board, so requests for one board never wait on another.
+    """
+
+    def __init__(self, max_boards: Optional[int] = None) -> None:
+        # Boards are never evicted, so ``create`` refuses past this many.
+        self.max_boards = max_boards
+        self._boards: Dict[str, Board] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def boards(self) -> List[Board]:
+        return list(self._boards.values())
+
+    def get(self, access_code: str) -> Optional[Board]:
+        return self._boards.get(access_code)
+
+    def add(self, board: Board) -> Board:
+        with self._lock:
+            self._boards[board.access_code] = board
+        return board
+
+    def create(self, rng: Optional[random.Random] = None) -> Board:
+        with self._lock:
+            if self.max_boards is not None and len(self._boards) >= self.max_boards:
+                raise TooManyBoards()
+            board = Board(rng)
+            while board.access_code in self._boards:
+                board = Board(rng)
+            self._boards[board.access_code] = board
+        return board
+
+    def rekey(self, old_code: str, board: Board) -> None:
+        """Re-register ``board`` after its access code changed (e.g. on reset)."""
+        with self._lock:
+            if self._boards.get(old_code) is board:
+                del self._boards[old_code]
+            self._boards[board.access_code] = board
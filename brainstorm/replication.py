@@ -0,0 +1,250 @@
+"""Board replicas for running several worker processes against one owner.
+
+The owner process holds the authoritative boards and runs a
+``ReplicationServer`` on a Unix socket. Each worker keeps a
+``ReplicaRegistry``: the first request for a board subscribes to it, receives
+a snapshot and then follows the owner's events, replaying them into a local
+``Board`` that serves reads. Writes are sent to the owner with ``forward``.
+
+The protocol is one line per message, a type letter, a space and JSON:
+``S`` snapshot, ``E`` event, ``D`` live drag positions, ``U`` unknown board.
+A subscription is a single line holding the access code, empty for the
+owner's default board.
+"""
+
+import http.client
+import json
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+from brainstorm.domain import Board
+from brainstorm.persistence import decode_event, decode_snapshot, encode_event, encode_snapshot
+
+# How often the owner sends coalesced drag positions while a drag is live.
+DRAG_TICK = 0.05
+# How long a replicated write waits for its own effect to reach the replica.
+CATCH_UP_TIMEOUT = 2.0
+# Upper bound on how long the owner waits for a change before re-checking.
+FOLLOW_TIMEOUT = 15.0
+# How long a worker remembers that the owner has no board for an access code,
+# so repeated requests with a made-up code do not each cost the owner a
+# connection and a thread.
+UNKNOWN_CODE_TTL = 5.0
+MAX_UNKNOWN_CODES = 10_000
+
+
+class OwnerUnavailable(Exception):
+    """The owner process cannot be reached over its Unix sockets."""
+
+
+def replication_path(owner_socket: str) -> str:
+    return f"{owner_socket}.replication"
+
+
+class ReplicationServer:
+    """Streams the boards returned by ``lookup`` to subscribed replicas."""
+
+    def __init__(self, lookup: Callable[[str], Optional[Board]], path: str) -> None:
+        self.lookup = lookup
+        self.path = path
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+
+    def start(self) -> None:
+        threading.Thread(target=self._accept, name="replication", daemon=True).start()
+
+    def close(self) -> None:
+        self._listener.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rw", encoding="utf-8") as stream:
+            board = self.lookup(stream.readline().strip())
+            try:
+                if board is None:
+                    stream.write("U {}\n")
+                    stream.flush()
+                    return
+                self._follow(board, stream)
+            except OSError:
+                # The replica went away.
+                return
+
+    def _follow(self, board: Board, stream: TextIO) -> None:
+        version: Optional[int] = None
+        drag_seq = -1
+        while True:
+            events = board.changes_since(version) if version is not None else None
+            if events is None:
+                snapshot = board.snapshot()
+                version = snapshot.version
+                stream.write(f"S {encode_snapshot(snapshot)}\n")
+            else:
+                for event in events:
+                    stream.write(f"E {encode_event(event)}\n")
+                    version = event.version
+            if board.drag_seq != drag_seq:
+                drag_seq = board.drag_seq
+                stream.write(f"D {json.dumps(board.live_positions())}\n")
+            stream.flush()
+            # live_positions() also expires abandoned drags, ending the ticking.
+            if board.drag_positions and board.live_positions():
+                time.sleep(DRAG_TICK)
+            else:
+                board.wait_for_change(version, FOLLOW_TIMEOUT, drag_seq)
+
+
+class ReplicaRegistry:
+    """Local copies of the owner's boards, looked up by access code.
+
+    Each board is subscribed on first use and then kept up to date by a
+    background thread; the copies are only written by that thread.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._boards: Dict[str, Board] = {}
+        # access code -> when the owner's "unknown board" answer expires
+        self._unknown: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def boards(self) -> List[Board]:
+        return list(self._boards.values())
+
+    def get(self, access_code: str) -> Optional[Board]:
+        board = self._boards.get(access_code)
+        if board is not None or not access_code:
+            return board
+        now = time.monotonic()
+        if self._unknown.get(access_code, now) > now:
+            return None
+        board = self._subscribe(access_code)
+        if board is None:
+            with self._lock:
+                if len(self._unknown) >= MAX_UNKNOWN_CODES:
+                    self._unknown = {
+                        code: expiry for code, expiry in self._unknown.items() if expiry > now
+                    }
+                    if len(self._unknown) >= MAX_UNKNOWN_CODES // 2:
+                        self._unknown = {}
+                self._unknown[access_code] = now + UNKNOWN_CODE_TTL
+        return board
+
+    def default(self) -> Board:
+        board = self._subscribe("")
+        if board is None:
+            raise RuntimeError("owner has no default board")
+        return board
+
+    def _subscribe(self, access_code: str) -> Optional[Board]:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self.path)
+            stream = connection.makefile("rw", encoding="utf-8")
+            stream.write(f"{access_code}\n")
+            stream.flush()
+            line = stream.readline()
+        except OSError as exc:
+            connection.close()
+            raise OwnerUnavailable() from exc
+        if not line:
+            # The owner closed the connection without answering.
+            stream.close()
+            connection.close()
+            raise OwnerUnavailable()
+        kind, payload = line.split(" ", 1)
+        if kind != "S":
+            stream.close()
+            connection.close()
+            return None
+        board = Board()
+        board.reports_operations = False
+        board.restore(decode_snapshot(payload))
+        with self._lock:
+            # Another thread may have subscribed to the same board meanwhile.
+            existing = self._boards.get(board.access_code)
+            if existing is not None:
+                stream.close()
+                connection.close()
+                return existing
+            self._boards[board.access_code] = board
+        thread = threading.Thread(
+            target=self._follow, args=(board, connection, stream), daemon=True
+        )
+        thread.start()
+        return board
+
+    def _follow(self, board: Board, connection: socket.socket, stream: TextIO) -> None:
+        with connection, stream:
+            for line in stream:
+                kind, payload = line.split(" ", 1)
+                old_code = board.access_code
+                if kind == "S":
+                    board.restore(decode_snapshot(payload))
+                elif kind == "E":
+                    event = decode_event(payload)
+                    if event.version > board.version:
+                        board.replay(event)
+                elif kind == "D":
+                    board.mirror_drags(json.loads(payload))
+                if board.access_code != old_code:
+                    self.rekey(old_code, board)
+        # The owner is gone; forget the copy rather than serve it stale forever.
+        with self._lock:
+            if self._boards.get(board.access_code) is board:
+                del self._boards[board.access_code]
+
+    def rekey(self, old_code: str, board: Board) -> None:
+        with self._lock:
+            if self._boards.get(old_code) is board:
+                del self._boards[old_code]
+            self._boards[board.access_code] = board
+
+
+def wait_for_version(board: Board, version: int, timeout: float = CATCH_UP_TIMEOUT) -> bool:
+    """Wait until a replica has applied ``version``; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while board.version < version:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        board.wait_for_change(board.version, remaining)
+    return True
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def forward(
+    owner_socket: str, method: str, url: str, headers: Dict[str, str], body: bytes
+) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    """Send an HTTP request to the owner over its Unix socket."""
+    connection = _UnixHTTPConnection(owner_socket)
+    try:
+        connection.request(method, url, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.getheaders(), response.read()
+    except OSError as exc:
+        raise OwnerUnavailable() from exc
+    finally:
+        connection.close()
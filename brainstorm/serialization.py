@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from brainstorm.compression import MIN_COMPRESSED_SIZE, compress
+from brainstorm.domain import Board, Note, Participant, Viewport
+
+
+def format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+def note_to_dict(note: Note) -> Dict[str, Any]:
+    return {**asdict(note), "created_at": format_timestamp(note.created_at)}
+
+
+def participant_to_dict(participant: Participant) -> Dict[str, Any]:
+    return asdict(participant)
+
+
+def dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+EXPORT_FIELDS = ("id", "text", "author_name", "color", "x", "y", "created_at", "score")
+# Spreadsheets evaluate a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_lines(scored_notes: Iterable[Tuple[Note, int]], export_format: str) -> Iterator[str]:
+    """Encode notes one line at a time, as NDJSON or as CSV with a header row.
+
+    CSV text that a spreadsheet would run as a formula is prefixed with ``'``.
+    """
+    if export_format == "ndjson":
+        for note, score in scored_notes:
+            yield json.dumps({**note_to_dict(note), "score": score}) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for note, score in scored_notes:
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        entry = {**note_to_dict(note), "score": score}
+        writer.writerow([_csv_cell(entry[name]) for name in EXPORT_FIELDS])
+    yield buffer.getvalue()
+
+
+class BoardStateCache:
+    """Encoded ``/api/board`` body for one board, rebuilt only when its version moves.
+
+    Notes and participants are immutable, so their encoded fragments are kept
+    per object and reused as long as the board still holds the same object.
+    """
+
+    def __init__(self) -> None:
+        self._body: Optional[Tuple[int, bytes]] = None
+        self._compressed: Dict[str, Tuple[int, bytes]] = {}
+        self._notes: Dict[str, Tuple[Note, bytes]] = {}
+        self._participants: Dict[str, Tuple[Participant, bytes]] = {}
+
+    def encode(self, board: Board, viewport: Optional[Viewport] = None) -> Tuple[int, bytes]:
+        """Return ``(version, body)`` for the board, or for the notes inside ``viewport``.
+
+        Only the full-board body is cached; viewport bodies reuse note fragments.
+        """
+        if viewport is None:
+            cached = self._body
+            if cached is not None and cached[0] == board.version:
+                return cached
+
+        snapshot = board.snapshot(viewport)
+        notes = [self._note_entry(note) for note in snapshot.notes]
+        participants = [self._participant_entry(p) for p in snapshot.participants]
+        body = b"".join(
+            [
+                b'{"version":%d,"phase":' % snapshot.version,
+                dumps(snapshot.phase.value),
+                b',"participants":[',
+                b",".join(fragment for _, fragment in participants),
+                b'],"stickies":[',
+                b",".join(fragment for _, fragment in notes),
+                b'],"votes":',
+                dumps(snapshot.votes_by_note),
+                b',"scores":',
+                dumps(snapshot.scores),
+                b',"spent":',
+                dumps(snapshot.spent_points),
+                b"}",
+            ]
+        )
+        if viewport is None:
+            self._body = (snapshot.version, body)
+            self._notes = {entry[0].id: entry for entry in notes}
+            self._participants = {entry[0].name: entry for entry in participants}
+        elif len(self._notes) > 2 * len(board.notes) + 64:
+            # Other request threads add fragments meanwhile: iterate a copy.
+            self._notes = {
+                note_id: entry
+                for note_id, entry in list(self._notes.items())
+                if note_id in board.notes
+            }
+        return snapshot.version, body
+
+    def encode_as(
+        self, board: Board, encoding: Optional[str], viewport: Optional[Viewport] = None
+    ) -> Tuple[int, Optional[str], bytes]:
+        """Like ``encode``, compressed with ``encoding`` if the body is large enough.
+
+        Returns ``(version, content_encoding, body)``, ``content_encoding`` being
+        None when the body is sent as is. Compressed full-board bodies are cached
+        per encoding, so each is compressed once per version, not once per poll.
+        """
+        version, body = self.encode(board, viewport)
+        if encoding is None or len(body) < MIN_COMPRESSED_SIZE:
+            return version, None, body
+        if viewport is not None:
+            return version, encoding, compress(body, encoding)
+        cached = self._compressed.get(encoding)
+        if cached is None or cached[0] != version:
+            cached = self._compressed[encoding] = (version, compress(body, encoding))
+        return version, encoding, cached[1]
+
+    def _note_entry(self, note: Note) -> Tuple[Note, bytes]:
+        entry = self._notes.get(note.id)
+        if entry is None or entry[0] is not note:
+            entry = (note, dumps(note_to_dict(note)))
+            self._notes[note.id] = entry
+        return entry
+
+    def _participant_entry(self, participant: Participant) -> Tuple[Participant, bytes]:
+        entry = self._participants.get(participant.name)
+        if entry is None or entry[0] is not participant:
+            entry = (participant, dumps(participant_to_dict(participant)))
+            self._participants[participant.name] = entry
+        return entry
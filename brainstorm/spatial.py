@@ -0,0 +1,101 @@
+import math
+from typing import Collection, Dict, Iterator, Mapping, Set, Tuple
+
+Cell = Tuple[int, int]
+
+
+class _Grid:
+    def __init__(self, cell_size: float, cells: Mapping[Cell, Collection[str]]) -> None:
+        self.cell_size = cell_size
+        self._cells = cells
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[str]:
+        """Yield keys in cells overlapping the rectangle; callers check exact bounds."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Rectangle spans more cells than are occupied: scan occupied ones.
+            for (cx, cy), bucket in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield from bucket
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield from self._cells.get((cx, cy), ())
+
+
+class GridSnapshot(_Grid):
+    """A read-only GridIndex as of ``GridIndex.snapshot()``."""
+
+    _cells: Mapping[Cell, Tuple[str, ...]]
+
+
+class GridIndex(_Grid):
+    """Uniform grid over point positions, for rectangle (viewport) queries.
+
+    Keys are bucketed by the cell their point falls in; a query visits only
+    the cells overlapping the rectangle, so its cost follows the queried area
+    rather than the number of keys.
+    """
+
+    _cells: Dict[Cell, Set[str]]
+
+    def __init__(self, cell_size: float = 256.0) -> None:
+        super().__init__(cell_size, {})
+        self._key_cells: Dict[str, Cell] = {}
+        # Buckets as of the last snapshot(), shared with it; _dirty lists the
+        # cells changed since, the only ones the next snapshot() rebuilds.
+        self._frozen: Dict[Cell, Tuple[str, ...]] = {}
+        self._dirty: Set[Cell] = set()
+
+    def __len__(self) -> int:
+        return len(self._key_cells)
+
+    def insert(self, key: str, x: float, y: float) -> None:
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, set()).add(key)
+        self._key_cells[key] = cell
+        self._dirty.add(cell)
+
+    def move(self, key: str, x: float, y: float) -> None:
+        if self._key_cells.get(key) != self._cell(x, y):
+            self.remove(key)
+            self.insert(key, x, y)
+
+    def remove(self, key: str) -> None:
+        cell = self._key_cells.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self._cells[cell]
+        self._dirty.add(cell)
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._key_cells.clear()
+        self._frozen = {}
+        self._dirty.clear()
+
+    def snapshot(self) -> GridSnapshot:
+        """Immutable copy of the index, unaffected by later changes.
+
+        Costs one pointer per occupied cell plus the keys of the cells changed
+        since the previous snapshot; unchanged buckets are shared.
+        """
+        if self._dirty:
+            frozen = dict(self._frozen)
+            for cell in self._dirty:
+                bucket = self._cells.get(cell)
+                if bucket:
+                    # A tuple: queries only iterate buckets, and it skips rehashing.
+                    frozen[cell] = tuple(bucket)
+                else:
+                    frozen.pop(cell, None)
+            self._frozen = frozen
+            self._dirty = set()
+        return GridSnapshot(self.cell_size, self._frozen)
@@ -0,0 +1,276 @@
+"""Recording of the calls a board receives, and their replay on a fresh board.
+
+A recording is gzipped NDJSON. The first line holds the board's snapshot and
+RNG state when recording started. Each following line is one call:
+``[seconds since start, operation, args, kwargs, exception name or null]``.
+On ``close`` a last line holds the state hash of the board.
+
+Writes are recorded under the board lock, in the order they were applied.
+Replaying them on a board restored from the header, with the same RNG state,
+reproduces the same ids and access codes and so the same final state. Only
+``created_at`` differs, as it comes from the clock; ``state_hash`` leaves it
+out. Reads and drags are recorded too, for their timing, but they do not
+change the state.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from brainstorm.domain import (
+    Board,
+    BoardSnapshot,
+    DeleteNote,
+    MoveNote,
+    NoteDraft,
+    Phase,
+    SetVote,
+)
+from brainstorm.persistence import decode_snapshot, encode_snapshot
+
+# Board methods reached from the API. Anything else calling into a recorded
+# board (restore, replay) is not part of the workload.
+OPERATIONS = {
+    "join",
+    "add_note",
+    "import_notes",
+    "move_note",
+    "drag_note",
+    "delete_note",
+    "change_phase",
+    "set_vote",
+    "apply_batch",
+    "reset",
+    "snapshot",
+    "changes_since",
+    "top",
+    "scored_notes",
+}
+# [seconds since start, operation, args, kwargs, exception name or None]
+Call = Tuple[float, str, List[Any], Dict[str, Any], Optional[str]]
+# Dataclasses that appear in arguments, encoded as {"type": name, **fields}.
+ARGUMENT_TYPES = {cls.__name__: cls for cls in (MoveNote, DeleteNote, SetVote, NoteDraft)}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Phase):
+        return {"type": "Phase", "value": value.value}
+    if type(value).__name__ in ARGUMENT_TYPES:
+        return {"type": type(value).__name__, **asdict(value)}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "type" in value:
+        if value["type"] == "Phase":
+            return Phase(value["value"])
+        cls = ARGUMENT_TYPES[value["type"]]
+        return cls(**{item.name: value[item.name] for item in fields(cls)})
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def state_hash(snapshot: BoardSnapshot) -> str:
+    """SHA-256 of a board's state, leaving out note timestamps."""
+    state = {
+        "version": snapshot.version,
+        "phase": snapshot.phase.value,
+        "access_code": snapshot.access_code,
+        "participants": [asdict(participant) for participant in snapshot.participants],
+        "notes": [{**asdict(note), "created_at": None} for note in snapshot.notes],
+        "votes": snapshot.votes_by_note,
+    }
+    encoded = json.dumps(state, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class WorkloadRecorder:
+    """Records the calls ``board`` receives to a gzipped file at ``path``.
+
+    The recorder hook only queues the call; a background thread encodes and
+    writes the queue, so recording adds little to each call.
+    """
+
+    def __init__(self, board: Board, path: str) -> None:
+        self.board = board
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._pending: List[Tuple[float, str, Tuple[Any, ...], Dict[str, Any], Optional[str]]] = []
+        self._queued = threading.Condition()
+        self._closing = self._closed = False
+        self._started = time.monotonic()
+        snapshot, rng_state = board.start_recording(self._on_call)
+        header = {"rng_state": rng_state, "snapshot": json.loads(encode_snapshot(snapshot))}
+        self._file.write(json.dumps(header) + "\n")
+        self._thread = threading.Thread(target=self._run, name="workload-recorder", daemon=True)
+        self._thread.start()
+
+    def _on_call(
+        self,
+        operation: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        error: Optional[BaseException],
+    ) -> None:
+        if operation not in OPERATIONS:
+            return
+        call = (
+            time.monotonic() - self._started,
+            operation,
+            args,
+            kwargs,
+            None if error is None else type(error).__name__,
+        )
+        with self._queued:
+            self._pending.append(call)
+            self._queued.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._queued:
+                while not self._pending and not self._closed:
+                    self._queued.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+            self._file.write(
+                "".join(
+                    json.dumps(
+                        [
+                            round(offset, 6),
+                            operation,
+                            _encode_value(args),
+                            {key: _encode_value(value) for key, value in kwargs.items()},
+                            error,
+                        ]
+                    )
+                    + "\n"
+                    for offset, operation, args, kwargs, error in batch
+                )
+            )
+
+    def close(self) -> None:
+        """Stop recording, write the final state hash and close the file."""
+        with self._queued:
+            if self._closing:
+                return
+            self._closing = True
+        final_hash = state_hash(self.board.stop_recording())
+        # Only now may the writer stop: every recorded call has been queued.
+        with self._queued:
+            self._closed = True
+            self._queued.notify()
+        self._thread.join()
+        self._file.write(json.dumps({"state_hash": final_hash}) + "\n")
+        self._file.close()
+
+
+def record(board: Board, path: str) -> WorkloadRecorder:
+    """Record ``board`` to ``path`` until the process exits."""
+    recorder = WorkloadRecorder(board, path)
+    atexit.register(recorder.close)
+    return recorder
+
+
+@dataclass
+class Recording:
+    board: Board  # restored to the state recording started from
+    calls: List[Call]
+    state_hash: Optional[str]  # None if the recording was not closed
+
+
+def load(path: str) -> Recording:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        calls = []
+        final_hash = None
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn last line: the process died while writing.
+                break
+            if isinstance(entry, dict):
+                final_hash = entry["state_hash"]
+            else:
+                offset, operation, args, kwargs, error = entry
+                kwargs = {key: _decode_value(value) for key, value in kwargs.items()}
+                calls.append((offset, operation, _decode_value(args), kwargs, error))
+    board = Board()
+    board.restore(decode_snapshot(json.dumps(header["snapshot"])))
+    version, state, gauss = header["rng_state"]
+    board.rng.setstate((version, tuple(state), gauss))
+    return Recording(board=board, calls=calls, state_hash=final_hash)
+
+
+@dataclass
+class ReplayReport:
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+    # Calls whose outcome (exception or none) differed from the recording.
+    mismatches: int = 0
+    state_hash: str = ""
+    expected_hash: Optional[str] = None
+
+    @property
+    def verified(self) -> Optional[bool]:
+        if self.expected_hash is None:
+            return None
+        return self.state_hash == self.expected_hash
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for operation, timings in sorted(self.timings.items()):
+            ordered = sorted(timings)
+            result[operation] = {
+                "count": len(ordered),
+                "total_ms": sum(ordered) * 1000,
+                "p50_us": statistics.median(ordered) * 1_000_000,
+                "p99_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1_000_000,
+            }
+        return result
+
+
+def replay(recording: Recording, speed: Optional[float] = None) -> ReplayReport:
+    """Re-drive ``recording.board`` with the recorded calls and time each one.
+
+    With ``speed`` the calls keep their recorded spacing, divided by ``speed``
+    (1.0 for real time); without it they run back to back.
+    """
+    board = recording.board
+    report = ReplayReport(expected_hash=recording.state_hash)
+    started = time.monotonic()
+    for _, operation, args, kwargs, error in _paced(recording.calls, speed, started):
+        method = getattr(board, operation)
+        outcome = None
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+            if operation == "scored_notes":
+                # The export streams it; consume it as the export would.
+                for _ in result:
+                    pass
+        except Exception as exc:
+            outcome = type(exc).__name__
+        report.timings.setdefault(operation, []).append(time.perf_counter() - start)
+        if outcome != error:
+            report.mismatches += 1
+    report.state_hash = state_hash(board.snapshot())
+    return report
+
+
+def _paced(calls: List[Call], speed: Optional[float], started: float) -> Iterator[Call]:
+    for call in calls:
+        if speed is not None:
+            delay = started + call[0] / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        yield call
@@ -0,0 +1,37 @@
+"""Owner process for running the board behind several worker processes.
+
+The owner holds the authoritative boards; workers started with
+BRAINSTORM_OWNER_SOCKET serve reads from replicas and forward writes here:
+
+    python owner.py /tmp/brainstorm.sock
+    BRAINSTORM_OWNER_SOCKET=/tmp/brainstorm.sock gunicorn -w 4 -b 0.0.0.0:5000 app:app
+"""
+
+import os
+import sys
+from typing import Optional
+
+# This process is the owner even if the variable is exported for the workers.
+os.environ.pop("BRAINSTORM_OWNER_SOCKET", None)
+
+from werkzeug.serving import run_simple  # noqa: E402
+
+import app  # noqa: E402
+from brainstorm.domain import Board  # noqa: E402
+from brainstorm.replication import ReplicationServer, replication_path  # noqa: E402
+
+
+def _lookup(access_code: str) -> Optional[Board]:
+    return app.registry.get(access_code) if access_code else app.board
+
+
+def main(socket_path: str) -> None:
+    for path in (socket_path, replication_path(socket_path)):
+        if os.path.exists(path):
+            os.unlink(path)
+    ReplicationServer(_lookup, replication_path(socket_path)).start()
+    run_simple(f"unix://{socket_path}", 0, app.app, threaded=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
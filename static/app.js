@@ -1,4 +1,14 @@
 const PAGE = document.body.dataset.page;
+const STREAM_READY_TIMEOUT_MS = 5000;
+const LONG_POLL_WAIT_S = 25;
+const POLL_RETRY_MS = 2500;
+const POLL_MAX_BACKOFF_MS = 30000;
+const VOTE_BATCH_DELAY_MS = 400;
+const DRAG_SEND_INTERVAL_MS = 50;
+const VIEWPORT_MARGIN_PX = 600;
+const VIEWPORT_RELOAD_DELAY_MS = 250;
+const RESULTS_LIMIT = 10;
+const RESULTS_REFRESH_MS = 1000;
 const errorBanner = document.getElementById("error-banner");
 
 function showError(message) {
@@ -47,7 +57,7 @@ function renderIndex() {
   });
 }
 
-async function fetchJson(url, options, accessCode) {
+async function fetchResponse(url, options, accessCode) {
   const response = await fetch(url, {
     ...options,
     headers: {
@@ -56,6 +66,9 @@ async function fetchJson(url, options, accessCode) {
       ...(options && options.headers),
     },
   });
+  if (response.status === 304) {
+    return null;
+  }
   if (!response.ok) {
     let message = `Request failed (${response.status})`;
     try {
@@ -64,7 +77,20 @@ async function fetchJson(url, options, accessCode) {
     } catch (err) {
       // ignore
     }
-    throw new Error(message);
+    const error = new Error(message);
+    error.status = response.status;
+    // Sent with 429 (rate limited) and 503 (server shedding load).
+    const retryAfter = Number(response.headers.get("Retry-After"));
+    if (retryAfter > 0) error.retryAfterMs = retryAfter * 1000;
+    throw error;
+  }
+  return response;
+}
+
+async function fetchJson(url, options, accessCode) {
+  const response = await fetchResponse(url, options, accessCode);
+  if (response === null) {
+    return null;
   }
   const contentType = response.headers.get("Content-Type") || "";
   if (contentType.includes("application/json")) {
@@ -73,90 +99,116 @@ async function fetchJson(url, options, accessCode) {
   return null;
 }
 
-function createStickyElement(note, scores, ownVotes, isVoting, isFinished, onMove, onVoteChange) {
-  const div = document.createElement("div");
-  div.className = "sticky";
-  div.dataset.id = note.id;
-  div.style.left = `${note.x}px`;
-  div.style.top = `${note.y}px`;
-  div.dataset.x = note.x;
-  div.dataset.y = note.y;
-  div.style.background = note.color || "#fff8b3";
-
+function createStickyElement() {
+  // Built once per note and then kept up to date by updateStickyElement.
+  const root = document.createElement("div");
+  root.className = "sticky";
   const text = document.createElement("div");
-  text.textContent = note.text;
-  div.appendChild(text);
-
   const meta = document.createElement("div");
   meta.className = "meta";
   const author = document.createElement("span");
-  author.textContent = note.author_name;
-  meta.appendChild(author);
   const score = document.createElement("span");
-  const totalScore = scores[note.id] || 0;
-  if (isVoting || isFinished) {
-    score.textContent = `Points: ${totalScore}`;
-    meta.appendChild(score);
-  }
-  div.appendChild(meta);
-
-  if (isVoting && typeof onVoteChange === "function") {
-    const voteWrapper = document.createElement("div");
-    voteWrapper.className = "vote-control";
-    const label = document.createElement("label");
-    label.textContent = "Your points";
-    const input = document.createElement("input");
-    input.type = "number";
-    input.min = "0";
-    input.max = "5";
-    input.value = ownVotes[note.id] || 0;
-    input.addEventListener("change", (event) => {
-      let val = parseInt(event.target.value, 10);
-      if (Number.isNaN(val)) val = 0;
-      val = Math.max(0, Math.min(5, val));
-      event.target.value = val;
-      onVoteChange(note.id, val);
-    });
-    voteWrapper.appendChild(label);
-    voteWrapper.appendChild(input);
-    div.appendChild(voteWrapper);
-  }
-
-  if (!isFinished && typeof onMove === "function") {
-    attachDragHandlers(div, onMove);
-  }
+  meta.append(author, score);
+  const voteWrapper = document.createElement("div");
+  voteWrapper.className = "vote-control";
+  const label = document.createElement("label");
+  label.textContent = "Your points";
+  const input = document.createElement("input");
+  input.type = "number";
+  input.min = "0";
+  input.max = "5";
+  input.dataset.role = "points";
+  voteWrapper.append(label, input);
+  root.append(text, meta, voteWrapper);
+  // Values last written to the DOM, so updates only touch what changed.
+  return { root, text, author, score, voteWrapper, input, shown: {} };
+}
 
-  return div;
+function showOnSticky(sticky, key, value, write) {
+  if (sticky.shown[key] === value) return;
+  sticky.shown[key] = value;
+  write(value);
 }
 
-function attachDragHandlers(element, onMove) {
-  let isDragging = false;
-  let offsetX = 0;
-  let offsetY = 0;
+function moveStickyElement(sticky, x, y) {
+  showOnSticky(sticky, "x", x, () => {
+    sticky.root.style.left = `${x}px`;
+    sticky.root.dataset.x = x;
+  });
+  showOnSticky(sticky, "y", y, () => {
+    sticky.root.style.top = `${y}px`;
+    sticky.root.dataset.y = y;
+  });
+}
 
-  element.addEventListener("mousedown", (event) => {
-    isDragging = true;
-    offsetX = event.offsetX;
-    offsetY = event.offsetY;
-    element.classList.add("dragging");
+function updateStickyElement(sticky, note, view) {
+  // view: { x, y, score, points, isVoting, isFinished, keepPoints }
+  showOnSticky(sticky, "id", note.id, (id) => { sticky.root.dataset.id = id; });
+  showOnSticky(sticky, "color", note.color || "#fff8b3", (color) => {
+    sticky.root.style.background = color;
+  });
+  showOnSticky(sticky, "text", note.text, (text) => { sticky.text.textContent = text; });
+  showOnSticky(sticky, "author", note.author_name, (name) => { sticky.author.textContent = name; });
+  if (!sticky.root.classList.contains("dragging")) moveStickyElement(sticky, view.x, view.y);
+  showOnSticky(sticky, "scoreHidden", !(view.isVoting || view.isFinished), (hidden) => {
+    sticky.score.hidden = hidden;
+  });
+  showOnSticky(sticky, "score", view.score, (score) => {
+    sticky.score.textContent = `Points: ${score}`;
   });
+  showOnSticky(sticky, "voteHidden", !view.isVoting, (hidden) => {
+    sticky.voteWrapper.hidden = hidden;
+  });
+  // The input is the user's while they edit it or their edit is unsent.
+  if (!view.keepPoints && sticky.input.value !== String(view.points)) {
+    sticky.input.value = view.points;
+  }
+}
 
-  document.addEventListener("mouseup", (event) => {
-    if (!isDragging) return;
-    isDragging = false;
-    element.classList.remove("dragging");
-    onMove(parseFloat(element.dataset.x), parseFloat(element.dataset.y));
+function attachDragHandler(canvas, canDrag, onMove) {
+  // One set of listeners for every sticky on the canvas, installed once.
+  // onMove(noteId, x, y, final): intermediate positions are sent at most every
+  // DRAG_SEND_INTERVAL_MS, the final one on mouseup commits the move.
+  let drag = null;
+
+  canvas.addEventListener("mousedown", (event) => {
+    const element = event.target.closest(".sticky");
+    if (!element || event.target.closest("input") || !canDrag()) return;
+    const rect = element.getBoundingClientRect();
+    drag = {
+      element,
+      offsetX: event.clientX - rect.left,
+      offsetY: event.clientY - rect.top,
+      lastSent: 0,
+    };
+    element.classList.add("dragging");
   });
 
   document.addEventListener("mousemove", (event) => {
-    if (!isDragging) return;
-    const parent = element.parentElement.getBoundingClientRect();
-    const x = event.clientX - parent.left - offsetX;
-    const y = event.clientY - parent.top - offsetY;
+    if (!drag) return;
+    const { element } = drag;
+    const parent = canvas.getBoundingClientRect();
+    const x = event.clientX - parent.left - drag.offsetX;
+    const y = event.clientY - parent.top - drag.offsetY;
     element.style.left = `${x}px`;
     element.style.top = `${y}px`;
     element.dataset.x = x;
     element.dataset.y = y;
+    const now = Date.now();
+    if (now - drag.lastSent >= DRAG_SEND_INTERVAL_MS) {
+      drag.lastSent = now;
+      onMove(element.dataset.id, x, y, false);
+    }
+  });
+
+  document.addEventListener("mouseup", () => {
+    if (!drag) return;
+    const { element } = drag;
+    drag = null;
+    element.classList.remove("dragging");
+    // The note may have been deleted while it was being dragged.
+    if (!element.isConnected) return;
+    onMove(element.dataset.id, parseFloat(element.dataset.x), parseFloat(element.dataset.y), true);
   });
 }
 
@@ -168,24 +220,34 @@ function renderBoard() {
   const addSection = document.getElementById("add-note-section");
   const noteInput = document.getElementById("note-text");
   const addButton = document.getElementById("add-note");
+  const importForm = document.getElementById("import-form");
+  const importFile = document.getElementById("import-file");
   const canvas = document.getElementById("board-canvas");
+  const resultsSection = document.getElementById("results-section");
+  const resultsList = document.getElementById("results-list");
   const organizerControls = document.getElementById("organizer-controls");
   const startVotingBtn = document.getElementById("start-voting");
   const finishBtn = document.getElementById("finish-board");
   const resetBtn = document.getElementById("reset-board");
+  const exportCsvBtn = document.getElementById("export-csv");
+  const exportNdjsonBtn = document.getElementById("export-ndjson");
   let currentPhase = "GENERATING";
+  let state = null;
 
   if (!accessCode || !name) {
     redirectHome();
     return;
   }
 
+  importForm.hidden = !isOrganizer;
   userNameLabel.textContent = `User: ${name}${isOrganizer ? " (organizer)" : ""}`;
 
-  function computeRemaining(votes) {
-    const allocations = votes[name] || {};
-    const used = Object.values(allocations).reduce((acc, v) => acc + v, 0);
-    return Math.max(0, 5 - used);
+  function ownPoints(noteId) {
+    return (state.votes[noteId] || {})[name] || 0;
+  }
+
+  function computeRemaining() {
+    return Math.max(0, 5 - (state.spent[name] || 0));
   }
 
   async function joinBoard() {
@@ -204,48 +266,272 @@ function renderBoard() {
     }
   }
 
-  function renderBoardState(data) {
-    currentPhase = data.phase;
-    phaseLabel.textContent = data.phase;
-    const remaining = computeRemaining(data.votes);
-    remainingPointsLabel.textContent = `Remaining points: ${remaining}`;
-    addSection.hidden = data.phase !== "GENERATING";
+  const stickyElements = new Map();
+  let dragSeq = -1;
+  let liveDrags = {};
+
+  function renderSticky(note, resetPoints = false) {
+    let sticky = stickyElements.get(note.id);
+    if (!sticky) {
+      sticky = createStickyElement();
+      stickyElements.set(note.id, sticky);
+      canvas.appendChild(sticky.root);
+    }
+    const [x, y] = liveDrags[note.id] || [note.x, note.y];
+    const editing = document.activeElement === sticky.input || pendingVotes.has(note.id);
+    updateStickyElement(sticky, note, {
+      x,
+      y,
+      score: state.scores[note.id] || 0,
+      points: ownPoints(note.id),
+      isVoting: state.phase === "VOTING",
+      isFinished: state.phase === "FINISHED",
+      keepPoints: editing && !resetPoints,
+    });
+  }
+
+  function removeSticky(noteId) {
+    const sticky = stickyElements.get(noteId);
+    if (!sticky) return;
+    sticky.root.remove();
+    stickyElements.delete(noteId);
+  }
+
+  async function sendMove(noteId, x, y, final) {
+    const action = final ? "move" : "drag";
+    try {
+      await fetchJson(`/api/stickies/${noteId}/${action}`, {
+        method: "POST",
+        body: JSON.stringify({ name, x, y }),
+      }, accessCode);
+      clearError();
+    } catch (error) {
+      showError(`Move failed: ${error.message}`);
+    }
+  }
+
+  attachDragHandler(canvas, () => state !== null && state.phase !== "FINISHED", sendMove);
+
+  canvas.addEventListener("change", (event) => {
+    if (event.target.dataset.role !== "points") return;
+    let val = parseInt(event.target.value, 10);
+    if (Number.isNaN(val)) val = 0;
+    val = Math.max(0, Math.min(5, val));
+    event.target.value = val;
+    queueVote(event.target.closest(".sticky").dataset.id, val);
+  });
+
+  const pendingVotes = new Map();
+  let voteTimer = null;
+
+  function queueVote(noteId, points) {
+    // Edits made in quick succession (e.g. moving points from one sticky to
+    // another) go out as one atomic batch, checked against the final allocation.
+    pendingVotes.set(noteId, points);
+    clearTimeout(voteTimer);
+    voteTimer = setTimeout(flushVotes, VOTE_BATCH_DELAY_MS);
+  }
+
+  async function flushVotes() {
+    const operations = Array.from(pendingVotes, ([stickyId, points]) => ({
+      op: "vote",
+      sticky_id: stickyId,
+      points,
+    }));
+    pendingVotes.clear();
+    try {
+      await fetchJson("/api/batch", {
+        method: "POST",
+        body: JSON.stringify({ name, operations }),
+      }, accessCode);
+      clearError();
+    } catch (error) {
+      showError(`Vote failed: ${error.message}`);
+      operations.forEach((operation) => {
+        const note = state.stickies.get(operation.sticky_id);
+        if (note) renderSticky(note, true);
+      });
+    }
+  }
+
+  function placeSticky(noteId, x, y) {
+    const sticky = stickyElements.get(noteId);
+    if (!sticky || sticky.root.classList.contains("dragging")) return;
+    moveStickyElement(sticky, x, y);
+  }
+
+  function applyDrag(drag) {
+    if (drag.seq === dragSeq) return;
+    dragSeq = drag.seq;
+    const previous = liveDrags;
+    liveDrags = drag.positions;
+    Object.keys(previous).forEach((noteId) => {
+      const note = state.stickies.get(noteId);
+      if (note && !(noteId in liveDrags)) placeSticky(noteId, note.x, note.y);
+    });
+    Object.entries(liveDrags).forEach(([noteId, [x, y]]) => placeSticky(noteId, x, y));
+  }
+
+  function renderHeader() {
+    currentPhase = state.phase;
+    phaseLabel.textContent = state.phase;
+    remainingPointsLabel.textContent = `Remaining points: ${computeRemaining()}`;
+    addSection.hidden = state.phase !== "GENERATING";
     organizerControls.hidden = !isOrganizer;
-    canvas.innerHTML = "";
-    data.stickies.forEach((note) => {
-      const stickyEl = createStickyElement(
-        note,
-        data.scores,
-        data.votes[name] || {},
-        data.phase === "VOTING",
-        data.phase === "FINISHED",
-        async (x, y) => {
-          try {
-            await fetchJson(`/api/stickies/${note.id}/move`, {
-              method: "POST",
-              body: JSON.stringify({ name, x, y }),
-            }, accessCode);
-            clearError();
-          } catch (error) {
-            showError(`Move failed: ${error.message}`);
-          }
-        },
-        async (noteId, val) => {
-          try {
-            await fetchJson("/api/votes", {
-              method: "POST",
-              body: JSON.stringify({ name, sticky_id: noteId, points: val }),
-            }, accessCode);
-            clearError();
-            const updated = await fetchJson("/api/board", { method: "GET" }, accessCode);
-            renderBoardState(updated);
-          } catch (error) {
-            showError(`Vote failed: ${error.message}`);
-          }
-        }
-      );
-      canvas.appendChild(stickyEl);
+    // Organizers watch a live leaderboard while voting; everyone sees the final one.
+    const showResults = state.phase === "FINISHED" || (isOrganizer && state.phase === "VOTING");
+    resultsSection.hidden = !showResults;
+    if (showResults) scheduleResults();
+  }
+
+  let resultsTimer = null;
+  let resultsEtag = null;
+
+  function scheduleResults() {
+    if (resultsTimer !== null) return;
+    resultsTimer = setTimeout(() => {
+      resultsTimer = null;
+      loadResults().catch((error) => showError(error.message));
+    }, RESULTS_REFRESH_MS);
+  }
+
+  async function loadResults() {
+    const headers = resultsEtag ? { "If-None-Match": resultsEtag } : {};
+    const url = `/api/results?limit=${RESULTS_LIMIT}`;
+    const response = await fetchResponse(url, { method: "GET", headers }, accessCode);
+    if (!response) return;
+    resultsEtag = response.headers.get("ETag");
+    const data = await response.json();
+    resultsList.innerHTML = "";
+    data.results.forEach((entry) => {
+      const item = document.createElement("li");
+      item.textContent = `${entry.sticky.text} (${entry.sticky.author_name}): ${entry.score}`;
+      resultsList.appendChild(item);
+    });
+  }
+
+  function renderStickies() {
+    // Keyed by note id: existing elements are updated in place, so drags,
+    // focused inputs and listeners survive every refresh.
+    renderHeader();
+    stickyElements.forEach((_, noteId) => {
+      if (!state.stickies.has(noteId)) removeSticky(noteId);
     });
+    state.stickies.forEach((note) => renderSticky(note));
+  }
+
+  function renderBoardState(data, etag) {
+    state = {
+      version: data.version,
+      phase: data.phase,
+      stickies: new Map(data.stickies.map((note) => [note.id, note])),
+      votes: data.votes,
+      scores: data.scores,
+      spent: data.spent,
+      etag,
+    };
+    renderStickies();
+  }
+
+  function applyEvent(event) {
+    if (event.version <= state.version) return;
+    switch (event.type) {
+      case "note_added":
+        state.stickies.set(event.note.id, event.note);
+        state.scores[event.note.id] = 0;
+        renderSticky(event.note);
+        break;
+      case "note_moved": {
+        const note = state.stickies.get(event.note_id);
+        if (!note) {
+          scheduleViewportReload();
+          break;
+        }
+        note.x = event.x;
+        note.y = event.y;
+        placeSticky(note.id, note.x, note.y);
+        break;
+      }
+      case "note_deleted":
+        state.stickies.delete(event.note_id);
+        delete state.votes[event.note_id];
+        delete state.scores[event.note_id];
+        Object.entries(event.refunded).forEach(([voter, points]) => {
+          state.spent[voter] = (state.spent[voter] || 0) - points;
+        });
+        removeSticky(event.note_id);
+        renderHeader();
+        break;
+      case "vote_set": {
+        const voters = state.votes[event.note_id] || {};
+        voters[event.participant_name] = event.points;
+        state.votes[event.note_id] = voters;
+        state.scores[event.note_id] = event.score;
+        state.spent[event.participant_name] = event.spent;
+        const note = state.stickies.get(event.note_id);
+        if (note) renderSticky(note);
+        renderHeader();
+        break;
+      }
+      case "phase_changed":
+        state.phase = event.phase;
+        renderStickies();
+        break;
+      case "reset":
+        redirectHome();
+        break;
+      default:
+        break;
+    }
+    state.version = event.version;
+  }
+
+  function visibleRegion() {
+    const rect = canvas.getBoundingClientRect();
+    const x0 = Math.floor(-rect.left - VIEWPORT_MARGIN_PX);
+    const y0 = Math.floor(-rect.top - VIEWPORT_MARGIN_PX);
+    const x1 = Math.ceil(window.innerWidth - rect.left + VIEWPORT_MARGIN_PX);
+    const y1 = Math.ceil(window.innerHeight - rect.top + VIEWPORT_MARGIN_PX);
+    return `${x0},${y0},${x1},${y1}`;
+  }
+
+  async function loadSnapshot() {
+    const headers = state === null ? {} : { "If-None-Match": state.etag };
+    const url = `/api/board?viewport=${visibleRegion()}`;
+    const response = await fetchResponse(url, { method: "GET", headers }, accessCode);
+    if (response) renderBoardState(await response.json(), response.headers.get("ETag"));
+  }
+
+  let viewportReloadTimer = null;
+
+  function scheduleViewportReload() {
+    if (viewportReloadTimer !== null) return;
+    viewportReloadTimer = setTimeout(() => {
+      viewportReloadTimer = null;
+      loadSnapshot().catch((error) => showError(error.message));
+    }, VIEWPORT_RELOAD_DELAY_MS);
+  }
+
+  async function applyChanges(changes) {
+    if (changes.drag) applyDrag(changes.drag);
+    if (changes.resync) {
+      await loadSnapshot();
+      return;
+    }
+    changes.events.forEach(applyEvent);
+  }
+
+  async function refreshBoard(wait = 0) {
+    if (state === null) {
+      await loadSnapshot();
+      return;
+    }
+    const changes = await fetchJson(
+      `/api/board/changes?since=${state.version}&wait=${wait}&drag_seq=${dragSeq}`,
+      { method: "GET" },
+      accessCode
+    );
+    await applyChanges(changes);
   }
 
   addButton?.addEventListener("click", async () => {
@@ -264,8 +550,7 @@ function renderBoard() {
       }, accessCode);
       clearError();
       noteInput.value = "";
-      const updated = await fetchJson("/api/board", { method: "GET" }, accessCode);
-      renderBoardState(updated);
+      await refreshBoard();
     } catch (error) {
       showError(`Add failed: ${error.message}`);
     }
@@ -278,8 +563,7 @@ function renderBoard() {
         body: JSON.stringify({ name, phase: "VOTING" }),
       }, accessCode);
       clearError();
-      const updated = await fetchJson("/api/board", { method: "GET" }, accessCode);
-      renderBoardState(updated);
+      await refreshBoard();
     } catch (error) {
       showError(`Cannot start voting: ${error.message}`);
     }
@@ -292,13 +576,47 @@ function renderBoard() {
         body: JSON.stringify({ name, phase: "FINISHED" }),
       }, accessCode);
       clearError();
-      const updated = await fetchJson("/api/board", { method: "GET" }, accessCode);
-      renderBoardState(updated);
+      await refreshBoard();
     } catch (error) {
       showError(`Cannot finish: ${error.message}`);
     }
   });
 
+  importFile?.addEventListener("change", async () => {
+    const file = importFile.files[0];
+    if (!file) return;
+    try {
+      const params = new URLSearchParams({ name });
+      const result = await fetchJson(`/api/stickies/import?${params.toString()}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/x-ndjson" },
+        body: file,
+      }, accessCode);
+      importFile.value = "";
+      if (result.errors.length) {
+        const first = result.errors[0];
+        showError(
+          `Imported ${result.imported}; ${result.errors.length} lines rejected ` +
+            `(line ${first.line}: ${first.error})`
+        );
+      } else {
+        clearError();
+      }
+      await refreshBoard();
+    } catch (error) {
+      showError(`Import failed: ${error.message}`);
+    }
+  });
+
+  function downloadExport(format) {
+    // The response is an attachment, so the browser downloads it and stays on the board.
+    const params = new URLSearchParams({ access_code: accessCode, format });
+    window.location.href = `/api/export?${params.toString()}`;
+  }
+
+  exportCsvBtn?.addEventListener("click", () => downloadExport("csv"));
+  exportNdjsonBtn?.addEventListener("click", () => downloadExport("ndjson"));
+
   resetBtn?.addEventListener("click", async () => {
     if (!confirm("Reset board?")) return;
     try {
@@ -313,23 +631,84 @@ function renderBoard() {
     }
   });
 
-  let poller = null;
-  async function pollBoard() {
-    try {
-      const data = await fetchJson("/api/board", { method: "GET" }, accessCode);
-      renderBoardState(data);
-    } catch (error) {
-      console.error("Polling error", error.message);
+  let stream = null;
+  let stopped = false;
+
+  function openStream() {
+    // Resolves false when the "ready" event does not arrive in time, e.g. when
+    // a proxy buffers the response, so the caller can fall back to long-polling.
+    return new Promise((resolve) => {
+      const params = new URLSearchParams({ access_code: accessCode, since: String(state.version) });
+      const source = new EventSource(`/api/board/stream?${params.toString()}`);
+      const readyTimer = setTimeout(() => {
+        source.close();
+        resolve(false);
+      }, STREAM_READY_TIMEOUT_MS);
+      source.addEventListener("ready", () => {
+        clearTimeout(readyTimer);
+        stream = source;
+        resolve(true);
+      });
+      source.addEventListener("error", () => {
+        // EventSource retries by itself, except after a non-200 response
+        // (401, 429, ...): then it closes for good and polling takes over.
+        if (source.readyState !== EventSource.CLOSED || stopped) return;
+        clearTimeout(readyTimer);
+        if (stream === source) {
+          stream = null;
+          longPoll();
+        } else {
+          resolve(false);
+        }
+      });
+      source.addEventListener("drag", (event) => {
+        applyDrag(JSON.parse(event.data));
+      });
+      source.addEventListener("changes", (event) => {
+        applyChanges(JSON.parse(event.data)).catch((error) => {
+          console.error("Stream error", error.message);
+        });
+      });
+    });
+  }
+
+  async function longPoll() {
+    // Pause between polls: doubles on each failure (at least Retry-After when
+    // the server sends one) and halves on each success, so a busy server sees
+    // this client back off and return gradually rather than all at once.
+    let pauseMs = 0;
+    while (!stopped) {
+      if (pauseMs > 0) {
+        const jitter = 0.75 + Math.random() * 0.5;
+        await new Promise((resolve) => setTimeout(resolve, pauseMs * jitter));
+      }
+      try {
+        await refreshBoard(LONG_POLL_WAIT_S);
+        pauseMs = pauseMs < POLL_RETRY_MS / 8 ? 0 : pauseMs / 2;
+      } catch (error) {
+        console.error("Polling error", error.message);
+        const doubled = Math.max(POLL_RETRY_MS, pauseMs * 2);
+        pauseMs = Math.min(POLL_MAX_BACKOFF_MS, Math.max(doubled, error.retryAfterMs || 0));
+      }
     }
   }
 
-  joinBoard().then(() => {
-    pollBoard();
-    poller = setInterval(pollBoard, 2500);
-  });
+  joinBoard()
+    .then(loadSnapshot)
+    .then(openStream)
+    .then((streaming) => {
+      if (!streaming) longPoll();
+    })
+    .catch((error) => {
+      console.error("Board startup failed", error.message);
+    });
+
+  window.addEventListener("scroll", scheduleViewportReload, { passive: true });
+  window.addEventListener("resize", scheduleViewportReload);
 
   window.addEventListener("beforeunload", () => {
-    if (poller) clearInterval(poller);
+    stopped = true;
+    if (stream) stream.close();
   });
 }
 
@@ -1,14 +1,25 @@
+import csv
+import gzip
+import io
+import json
 import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 import app
 from brainstorm.domain import Board
+from brainstorm.ratelimit import InFlightLimit, RateLimiter
 
 
 @pytest.fixture(autouse=True)
-def _reset_board():
+def _reset_board(monkeypatch):
     app.set_board(Board(random.Random(0)))
+    # Tests fire requests far faster than people; rate limits get their own tests.
+    monkeypatch.setattr(app, "participant_limiter", RateLimiter(1e9, 1e9))
+    monkeypatch.setattr(app, "board_limiter", RateLimiter(1e9, 1e9))
     yield
 
 
@@ -213,3 +224,560 @@ def test_reset_clears_state_and_changes_access_code():
     status_resp = client.get("/api/status", headers={"X-Access-Code": after_reset_code})
     assert status_resp.status_code == 200
     assert status_resp.get_json()["participants_count"] == 0
+
+
+def test_board_etag_and_not_modified():
+    client = app.app.test_client()
+    first = client.get("/api/board", headers=auth_headers())
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag == f'"{first.get_json()["version"]}"'
+
+    cached = client.get("/api/board", headers={**auth_headers(), "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+
+    client.post("/api/join", json={"name": "alice", "is_organizer": False}, headers=auth_headers())
+    changed = client.get("/api/board", headers={**auth_headers(), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_board_changes_returns_deltas_since_version():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    since = client.get("/api/board", headers=auth_headers()).get_json()["version"]
+
+    note = client.post(
+        "/api/stickies",
+        json={"name": "org", "text": "idea", "x": 1, "y": 2},
+        headers=auth_headers(),
+    ).get_json()
+    client.post("/api/phase", json={"name": "org", "phase": "VOTING"}, headers=auth_headers())
+
+    response = client.get(f"/api/board/changes?since={since}", headers=auth_headers())
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["resync"] is False
+    assert data["version"] == since + 2
+    assert [event["type"] for event in data["events"]] == ["note_added", "phase_changed"]
+    assert data["events"][0]["note"] == note
+    assert data["events"][1]["phase"] == "VOTING"
+
+
+def test_board_changes_validation_and_resync():
+    client = app.app.test_client()
+    missing = client.get("/api/board/changes", headers=auth_headers())
+    assert missing.status_code == 400
+
+    future = client.get("/api/board/changes?since=99", headers=auth_headers())
+    assert future.get_json()["resync"] is True
+
+
+def test_board_changes_long_poll_waits_for_mutation():
+    client = app.app.test_client()
+    since = app.board.version
+    timer = threading.Timer(0.05, app.board.join, args=("alice", False))
+    timer.start()
+    response = client.get(f"/api/board/changes?since={since}&wait=5", headers=auth_headers())
+    timer.join()
+    data = response.get_json()
+    assert [event["type"] for event in data["events"]] == ["participant_joined"]
+    assert data["events"][0]["participant"]["name"] == "alice"
+
+    idle = client.get(
+        f"/api/board/changes?since={data['version']}&wait=0.01", headers=auth_headers()
+    )
+    assert idle.get_json()["events"] == []
+
+
+def test_board_stream_pushes_changes():
+    client = app.app.test_client()
+    response = client.get(
+        "/api/board/stream",
+        query_string={"since": app.board.version, "access_code": app.board.access_code},
+        buffered=False,
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert next(chunks).decode().startswith("id: 0\nevent: ready\n")
+
+    app.board.join("alice", False)
+    message = next(chunks).decode()
+    assert message.startswith("id: 1\nevent: changes\n")
+    assert '"participant_joined"' in message
+    response.close()
+
+
+def test_organizer_creates_independent_board():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    client.post("/api/join", json={"name": "bob", "is_organizer": False}, headers=auth_headers())
+
+    forbidden = client.post("/api/boards", json={"name": "bob"}, headers=auth_headers())
+    assert forbidden.status_code == 403
+
+    created = client.post("/api/boards", json={"name": "org"}, headers=auth_headers())
+    assert created.status_code == 201
+    other_headers = {"X-Access-Code": created.get_json()["access_code"]}
+    assert other_headers["X-Access-Code"] != app.board.access_code
+
+    joined = client.post(
+        "/api/join", json={"name": "org", "is_organizer": True}, headers=other_headers
+    )
+    assert joined.status_code == 200
+    other_status = client.get("/api/status", headers=other_headers).get_json()
+    assert other_status["participants_count"] == 1
+    default_status = client.get("/api/status", headers=auth_headers()).get_json()
+    assert default_status["participants_count"] == 2
+
+    app.registry.max_boards = 2
+    full = client.post("/api/boards", json={"name": "org"}, headers=auth_headers())
+    assert full.status_code == 503
+    assert full.get_json() == {"error": "board limit reached"}
+    assert len(app.registry) == 2
+
+
+def _check_board_payload(data):
+    for note_id, voters in data["votes"].items():
+        assert data["scores"][note_id] == sum(voters.values())
+    spent = {}
+    for voters in data["votes"].values():
+        for participant_name, points in voters.items():
+            spent[participant_name] = spent.get(participant_name, 0) + points
+    assert all(total <= 5 for total in spent.values())
+
+
+def test_concurrent_requests_keep_board_invariants():
+    headers = auth_headers()
+    names = [f"p{i}" for i in range(6)]
+    setup = app.app.test_client()
+    setup.post("/api/join", json={"name": "org", "is_organizer": True}, headers=headers)
+    for name in names:
+        setup.post("/api/join", json={"name": name, "is_organizer": False}, headers=headers)
+
+    def add_notes(name):
+        client = app.app.test_client()
+        statuses = []
+        for i in range(10):
+            response = client.post(
+                "/api/stickies",
+                json={"name": name, "text": f"{name} {i}", "x": i, "y": i},
+                headers=headers,
+            )
+            statuses.append(response.status_code)
+            board_response = client.get("/api/board", headers=headers)
+            statuses.append(board_response.status_code)
+            _check_board_payload(board_response.get_json())
+        return statuses
+
+    def vote_and_move(name):
+        client = app.app.test_client()
+        rng = random.Random(name)
+        note_ids = list(app.board.notes)
+        statuses = []
+        for _ in range(25):
+            note_id = rng.choice(note_ids)
+            vote = client.post(
+                "/api/votes",
+                json={"name": name, "sticky_id": note_id, "points": rng.randint(0, 5)},
+                headers=headers,
+            )
+            statuses.append(vote.status_code)
+            move = client.post(
+                f"/api/stickies/{note_id}/move",
+                json={"name": name, "x": rng.random(), "y": rng.random()},
+                headers=headers,
+            )
+            statuses.append(move.status_code)
+            board_response = client.get("/api/board", headers=headers)
+            statuses.append(board_response.status_code)
+            _check_board_payload(board_response.get_json())
+        return statuses
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            added = [s for statuses in pool.map(add_notes, names) for s in statuses]
+        setup.post("/api/phase", json={"name": "org", "phase": "VOTING"}, headers=headers)
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            voted = [s for statuses in pool.map(vote_and_move, names) for s in statuses]
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert set(added) == {200, 201}
+    assert set(voted) <= {200, 400}
+    board = app.board
+    assert len(board.notes) == len(names) * 10
+    assert all(total <= 5 for total in board.spent_points.values())
+    assert board.spent_points == {
+        name: sum(allocations.values()) for name, allocations in board.votes.items()
+    }
+    _check_board_payload(setup.get("/api/board", headers=headers).get_json())
+
+
+def test_batch_applies_operations_in_one_request():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    note_ids = [
+        client.post(
+            "/api/stickies",
+            json={"name": "org", "text": f"idea {i}", "x": 0, "y": 0},
+            headers=auth_headers(),
+        ).get_json()["id"]
+        for i in range(2)
+    ]
+    client.post("/api/phase", json={"name": "org", "phase": "VOTING"}, headers=auth_headers())
+
+    response = client.post(
+        "/api/batch",
+        json={
+            "name": "org",
+            "operations": [
+                {"op": "vote", "sticky_id": note_ids[0], "points": 3},
+                {"op": "vote", "sticky_id": note_ids[1], "points": 2},
+                {"op": "move", "sticky_id": note_ids[1], "x": 5, "y": 6},
+            ],
+        },
+        headers=auth_headers(),
+    )
+    assert response.status_code == 200
+    assert response.get_json()["version"] == app.board.version
+    assert app.board.scores == {note_ids[0]: 3, note_ids[1]: 2}
+
+    over_budget = client.post(
+        "/api/batch",
+        json={
+            "name": "org",
+            "operations": [
+                {"op": "move", "sticky_id": note_ids[0], "x": 9, "y": 9},
+                {"op": "vote", "sticky_id": note_ids[0], "points": 4},
+            ],
+        },
+        headers=auth_headers(),
+    )
+    assert over_budget.status_code == 400
+    assert app.board.notes[note_ids[0]].x == 0
+
+    malformed = client.post(
+        "/api/batch",
+        json={"name": "org", "operations": [{"op": "vote", "sticky_id": note_ids[0]}]},
+        headers=auth_headers(),
+    )
+    assert malformed.status_code == 400
+    assert malformed.get_json()["error"] == "operation 0: points must be integer"
+
+
+def test_live_drag_positions_reach_other_clients():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    note_id = client.post(
+        "/api/stickies",
+        json={"name": "org", "text": "idea", "x": 0, "y": 0},
+        headers=auth_headers(),
+    ).get_json()["id"]
+    version = app.board.version
+
+    stream = client.get(
+        "/api/board/stream",
+        query_string={"since": version, "access_code": app.board.access_code},
+        buffered=False,
+    )
+    chunks = iter(stream.response)
+    assert b"event: ready" in next(chunks)
+    assert b'"positions": {}' in next(chunks)
+
+    for x in range(1, 4):
+        dragged = client.post(
+            f"/api/stickies/{note_id}/drag",
+            json={"name": "org", "x": x, "y": 7},
+            headers=auth_headers(),
+        )
+        assert dragged.status_code == 200
+    frame = next(chunks).decode()
+    assert "event: drag" in frame
+    assert f'"{note_id}": [3.0, 7.0]' in frame
+    stream.close()
+    assert app.board.version == version
+
+    poll = client.get(
+        f"/api/board/changes?since={version}&drag_seq=0&wait=1", headers=auth_headers()
+    ).get_json()
+    assert poll["events"] == []
+    assert poll["drag"]["positions"] == {note_id: [3.0, 7.0]}
+
+
+def test_board_viewport_returns_only_visible_stickies():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    for x, y in [(10, 10), (500, 500), (2000, 40)]:
+        client.post(
+            "/api/stickies",
+            json={"name": "org", "text": f"at {x},{y}", "x": x, "y": y},
+            headers=auth_headers(),
+        )
+
+    response = client.get("/api/board?viewport=0,0,800,600", headers=auth_headers())
+    assert response.status_code == 200
+    assert sorted(s["text"] for s in response.get_json()["stickies"]) == ["at 10,10", "at 500,500"]
+    etag = response.headers["ETag"]
+    assert etag != client.get("/api/board", headers=auth_headers()).headers["ETag"]
+
+    cached = client.get(
+        "/api/board?viewport=0,0,800,600", headers={**auth_headers(), "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+    invalid = client.get("/api/board?viewport=1,2,3", headers=auth_headers())
+    assert invalid.status_code == 400
+    unbounded = client.get("/api/board?viewport=0,0,inf,inf", headers=auth_headers())
+    assert unbounded.status_code == 400
+
+
+def test_non_finite_coordinates_are_rejected_without_touching_the_board():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    note = client.post(
+        "/api/stickies", json={"name": "org", "text": "idea", "x": 1, "y": 2}, headers=auth_headers()
+    ).get_json()
+    version = app.board.version
+
+    for path, body in [
+        ("/api/stickies", '{"name": "org", "text": "nan", "x": NaN, "y": 0}'),
+        (f"/api/stickies/{note['id']}/move", '{"name": "org", "x": Infinity, "y": 0}'),
+        (f"/api/stickies/{note['id']}/drag", '{"name": "org", "x": 0, "y": -Infinity}'),
+    ]:
+        response = client.post(
+            path, data=body, content_type="application/json", headers=auth_headers()
+        )
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "coordinates must be numeric"
+
+    assert app.board.version == version
+    assert list(app.board.notes) == [note["id"]]
+    assert client.get("/api/export", headers=auth_headers()).status_code == 200
+
+
+def test_metrics_report_routes_operations_and_gauges(monkeypatch):
+    client = app.app.test_client()
+    assert client.get("/metrics").status_code == 401
+    client.post("/api/join", json={"name": "alice", "is_organizer": False}, headers=auth_headers())
+    client.post("/api/join", json={"name": "alice", "is_organizer": False}, headers=auth_headers())
+
+    text = client.get("/metrics", headers=auth_headers()).get_data(as_text=True)
+    assert "brainstorm_participants 1" in text
+    assert (
+        'brainstorm_http_request_duration_seconds_count{route="/api/join",method="POST",'
+        'status="409"}' in text
+    )
+    assert 'brainstorm_operation_duration_seconds_count{operation="join",error="none"}' in text
+    assert (
+        'brainstorm_operation_duration_seconds_count{operation="join",error="NameAlreadyExists"}'
+        in text
+    )
+
+    monkeypatch.setattr(app, "METRICS_TOKEN", "secret")
+    assert client.get("/metrics", headers=auth_headers()).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
+
+
+def test_results_rank_top_stickies_by_score():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    ids = []
+    for text in ["first", "second", "third"]:
+        payload = {"name": "org", "text": text, "x": 0, "y": 0}
+        response = client.post("/api/stickies", json=payload, headers=auth_headers())
+        ids.append(response.get_json()["id"])
+    client.post("/api/phase", json={"name": "org", "phase": "VOTING"}, headers=auth_headers())
+    client.post(
+        "/api/votes", json={"name": "org", "sticky_id": ids[2], "points": 3}, headers=auth_headers()
+    )
+
+    response = client.get("/api/results?limit=2", headers=auth_headers())
+    data = response.get_json()
+    assert [(r["rank"], r["score"], r["sticky"]["text"]) for r in data["results"]] == [
+        (1, 3, "third"),
+        (2, 0, "first"),
+    ]
+    cached = client.get(
+        "/api/results?limit=2",
+        headers={**auth_headers(), "If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+    assert client.get("/api/results?limit=0", headers=auth_headers()).status_code == 400
+    assert client.get("/api/results?limit=abc", headers=auth_headers()).status_code == 400
+
+
+def test_export_streams_stickies_with_scores_as_ndjson_and_csv():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    ids = []
+    for text in ["plain", 'quoted, "text"']:
+        payload = {"name": "org", "text": text, "x": 10, "y": 20}
+        response = client.post("/api/stickies", json=payload, headers=auth_headers())
+        ids.append(response.get_json()["id"])
+    client.post("/api/phase", json={"name": "org", "phase": "VOTING"}, headers=auth_headers())
+    client.post(
+        "/api/votes", json={"name": "org", "sticky_id": ids[1], "points": 2}, headers=auth_headers()
+    )
+
+    response = client.get("/api/export?format=ndjson", headers=auth_headers())
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(r["id"], r["author_name"], r["x"], r["score"]) for r in rows] == [
+        (ids[0], "org", 10, 0),
+        (ids[1], "org", 10, 2),
+    ]
+    assert rows[0]["created_at"].endswith("Z")
+
+    response = client.get(f"/api/export?format=csv&access_code={app.board.access_code}")
+    assert response.headers["Content-Disposition"].startswith("attachment;")
+    table = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(r["text"], r["score"]) for r in table] == [("plain", "0"), ('quoted, "text"', "2")]
+
+    assert client.get("/api/export?format=xml", headers=auth_headers()).status_code == 400
+
+
+def test_import_adds_ndjson_stickies_and_reports_bad_lines():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    client.post("/api/join", json={"name": "alice", "is_organizer": False}, headers=auth_headers())
+    body = "\n".join(
+        [
+            json.dumps({"author_name": "alice", "text": "seeded", "x": 1, "y": 2}),
+            json.dumps({"author_name": "mallory", "text": "not joined", "x": 1, "y": 2}),
+            "not json",
+            "",
+            json.dumps({"text": "x" * 201, "x": 0, "y": 0}),
+            json.dumps({"text": "mine", "x": 5, "y": 6}),
+            json.dumps({"author_name": "bob", "text": "no coordinates"}),
+        ]
+    )
+
+    response = client.post(
+        "/api/stickies/import?name=org",
+        data=body,
+        headers={**auth_headers(), "Content-Type": "application/x-ndjson"},
+    )
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["imported"] == 2
+    assert data["errors"] == [
+        {"line": 2, "error": "unknown participant"},
+        {"line": 3, "error": "invalid JSON"},
+        {"line": 5, "error": "sticky text exceeds 200 characters"},
+        {"line": 7, "error": "coordinates must be numeric"},
+    ]
+    assert "mallory" not in app.board.participants
+    assert sorted((n.author_name, n.text) for n in app.board.notes.values()) == [
+        ("alice", "seeded"),
+        ("org", "mine"),
+    ]
+
+    # An export of this board imports back as-is.
+    exported = client.get("/api/export", headers=auth_headers()).get_data()
+    client.post("/api/stickies/import?name=org", data=exported, headers=auth_headers())
+    assert len(app.board.notes) == 4
+
+    client.post("/api/join", json={"name": "eve", "is_organizer": False}, headers=auth_headers())
+    forbidden = client.post("/api/stickies/import?name=eve", data=body, headers=auth_headers())
+    assert forbidden.status_code == 403
+
+
+def test_large_json_responses_are_compressed_when_accepted():
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    for i in range(20):
+        payload = {"name": "org", "text": f"a longer idea, number {i}", "x": i, "y": i}
+        client.post("/api/stickies", json=payload, headers=auth_headers())
+    plain = client.get("/api/board", headers=auth_headers())
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    gzipped = client.get("/api/board", headers={**auth_headers(), "Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gzipped.data) == plain.data
+    assert gzipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    revalidated = client.get(
+        "/api/board",
+        headers={
+            **auth_headers(),
+            "Accept-Encoding": "gzip",
+            "If-None-Match": gzipped.headers["ETag"],
+        },
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == gzipped.headers["ETag"]
+
+    results = client.get("/api/results", headers={**auth_headers(), "Accept-Encoding": "gzip"})
+    assert results.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(results.data))["results"]
+    assert results.headers["ETag"].endswith('-gzip"')
+    status = client.get("/api/status", headers={**auth_headers(), "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in status.headers
+
+
+def test_pages_load_fingerprinted_immutable_assets():
+    client = app.app.test_client()
+    page = client.get("/").get_data(as_text=True)
+    script = app.assets.fingerprinted("app.js")
+    assert f'src="/assets/{script}"' in page
+
+    response = client.get(f"/assets/{script}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.mimetype.endswith("javascript")
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == app.assets.get(script).body
+    assert client.get("/assets/app.0000000000.js").status_code == 404
+
+
+def test_rate_limits_answer_429_with_retry_after(monkeypatch):
+    monkeypatch.setattr(app, "participant_limiter", RateLimiter(0.5, 3))
+    client = app.app.test_client()
+    client.post("/api/join", json={"name": "org", "is_organizer": True}, headers=auth_headers())
+    client.post("/api/join", json={"name": "bob", "is_organizer": False}, headers=auth_headers())
+
+    note = {"name": "org", "text": "x", "x": 0, "y": 0}
+    statuses = [
+        client.post("/api/stickies", json=note, headers=auth_headers()).status_code
+        for _ in range(3)
+    ]
+    limited = client.post("/api/stickies", json=note, headers=auth_headers())
+    assert statuses == [201, 201, 201]
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "2"
+    # Other participants and reads are not affected.
+    bob = {"name": "bob", "text": "y", "x": 0, "y": 0}
+    assert client.post("/api/stickies", json=bob, headers=auth_headers()).status_code == 201
+    assert client.get("/api/board", headers=auth_headers()).status_code == 200
+
+    board_limiter = RateLimiter(1, 1)
+    monkeypatch.setattr(app, "board_limiter", board_limiter)
+    for _ in range(3):
+        assert client.get("/api/status", headers={"X-Access-Code": "NOPE00"}).status_code == 401
+    assert client.get("/api/status", headers=auth_headers()).status_code == 200
+    assert client.get("/api/status", headers=auth_headers()).status_code == 429
+    # Unknown access codes are refused before they get a bucket.
+    assert list(board_limiter._buckets) == [app.board.access_code]
+
+
+def test_requests_past_the_in_flight_cap_are_shed_with_503(monkeypatch):
+    limit = InFlightLimit(1)
+    monkeypatch.setattr(app, "in_flight", limit)
+    client = app.app.test_client()
+    assert client.get("/api/status", headers=auth_headers()).status_code == 200
+    assert limit.in_flight == 0
+
+    limit.enter()  # another request is being handled
+    busy = client.get("/api/status", headers=auth_headers())
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    # Long-polls wait on the board rather than work, so they are not counted.
+    waiting = client.get("/api/board/changes?since=0&wait=0.01", headers=auth_headers())
+    assert waiting.status_code == 200
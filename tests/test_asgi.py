@@ -0,0 +1,168 @@
+import asyncio
+import json
+import random
+import threading
+
+import pytest
+
+import app
+import asgi
+from brainstorm.domain import Board
+from brainstorm.metrics import Metrics
+from brainstorm.ratelimit import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def _reset_board():
+    app.set_board(Board(random.Random(0)))
+    yield
+
+
+def _scope(method, path, query="", headers=()):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [
+            (b"x-access-code", app.board.access_code.encode()),
+            *((name.encode(), value.encode()) for name, value in headers),
+        ],
+    }
+
+
+async def _call(scope, body=b""):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.application(scope, receive, send)
+    status = sent[0]["status"]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return status, json.loads(body)
+
+
+def test_streamed_export_is_sent_in_chunks(monkeypatch):
+    monkeypatch.setattr(asgi, "STREAM_CHUNK_SIZE", 1024)
+    app.board.join("org", True)
+    for index in range(50):
+        app.board.add_note("org", f"idea {index}", index, index)
+
+    async def scenario():
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.application(_scope("GET", "/api/export", "format=ndjson"), receive, send)
+        return sent
+
+    sent = asyncio.run(scenario())
+    assert sent[0]["status"] == 200
+    bodies = sent[1:]
+    assert len(bodies) > 2
+    assert all(message["more_body"] for message in bodies[:-1])
+    assert not bodies[-1].get("more_body", False)
+    lines = b"".join(message["body"] for message in bodies).splitlines()
+    assert [json.loads(line)["text"] for line in lines] == [f"idea {i}" for i in range(50)]
+
+
+def test_delegated_routes_keep_domain_error_mapping():
+    async def scenario():
+        payload = json.dumps({"name": "alice", "is_organizer": False}).encode()
+        headers = [("content-type", "application/json")]
+        first = await _call(_scope("POST", "/api/join", headers=headers), payload)
+        second = await _call(_scope("POST", "/api/join", headers=headers), payload)
+        return first, second
+
+    (first_status, alice), (second_status, error) = asyncio.run(scenario())
+    assert first_status == 200 and alice["name"] == "alice"
+    assert second_status == 409 and error == {"error": "name already taken"}
+
+
+def test_long_poll_is_woken_by_a_write_from_another_thread():
+    async def scenario():
+        timer = threading.Timer(0.05, app.board.join, args=("alice", False))
+        timer.start()
+        result = await _call(_scope("GET", "/api/board/changes", "since=0&wait=5"))
+        timer.join()
+        return result
+
+    status, data = asyncio.run(scenario())
+    assert status == 200
+    assert [event["type"] for event in data["events"]] == ["participant_joined"]
+
+
+def test_stream_pushes_changes_until_disconnect():
+    async def scenario():
+        chunks = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            await chunks.put(message)
+
+        scope = _scope("GET", "/api/board/stream", "since=0")
+        task = asyncio.ensure_future(asgi.application(scope, receive, send))
+        start = await chunks.get()
+        ready = (await chunks.get())["body"].decode()
+        app.board.join("alice", False)
+        changes = ""
+        while "event: changes" not in changes:
+            # A drag frame may come first; the stream starts with drag_seq unknown.
+            changes = (await asyncio.wait_for(chunks.get(), 5))["body"].decode()
+        disconnected.set()
+        await asyncio.wait_for(task, 5)
+        return start, ready, changes
+
+    start, ready, changes = asyncio.run(scenario())
+    assert start["status"] == 200
+    assert ready.startswith("id: 0\nevent: ready\n")
+    assert changes.startswith("id: 1\nevent: changes\n")
+    assert '"participant_joined"' in changes
+
+
+def test_streams_are_rate_limited_labelled_and_measured(monkeypatch):
+    monkeypatch.setattr(app, "board_limiter", RateLimiter(1, 1))
+    monkeypatch.setattr(app, "metrics", Metrics())
+
+    async def open_stream():
+        sent = []
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.application(_scope("GET", "/api/board/stream", "since=0"), receive, send)
+        return sent[0], b"".join(message.get("body", b"") for message in sent[1:])
+
+    start, _ = asyncio.run(open_stream())
+    assert start["status"] == 200
+    assert (b"x-board-version", b"0") in start["headers"]
+
+    start, body = asyncio.run(open_stream())
+    assert start["status"] == 429
+    assert (b"retry-after", b"1") in start["headers"]
+    assert json.loads(body) == {"error": "too many requests"}
+
+    text = app.metrics.render({})
+    for status in (200, 429):
+        assert (
+            'brainstorm_http_request_duration_seconds_count{route="/api/board/stream",'
+            f'method="GET",status="{status}"}} 1' in text
+        )
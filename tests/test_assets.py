@@ -0,0 +1,29 @@
+import gzip
+
+from brainstorm.assets import build_asset, build_manifest
+
+
+def test_js_is_shipped_as_written_and_css_is_minified():
+    source = b"// a comment\nconst s = '`';\nconst t = `a\n    // not a comment\n`;\n"
+    assert build_asset("app.js", source).body == source
+    assert build_asset("a.css", b"/* note */\na {\n  color: red;\n}\n").body == b"a {\ncolor: red;\n}\n"
+
+
+def test_fingerprint_follows_content_and_large_assets_are_precompressed():
+    small = build_asset("styles.css", b"body {\n  margin: 0;\n}\n")
+    assert small.name.startswith("styles.") and small.name.endswith(".css")
+    assert small.mimetype == "text/css"
+    assert small.body == b"body {\nmargin: 0;\n}\n"
+    assert small.compressed == {}
+    assert build_asset("styles.css", b"body {\n  margin: 1px;\n}\n").name != small.name
+
+    large = build_asset("app.js", b"console.log('hello');\n" * 200)
+    assert gzip.decompress(large.compressed["gzip"]) == large.body
+
+
+def test_manifest_maps_source_names_to_fingerprinted_assets(tmp_path):
+    (tmp_path / "app.js").write_text("let a = 1;\n")
+    manifest = build_manifest(str(tmp_path))
+    name = manifest.fingerprinted("app.js")
+    assert manifest.get(name).body == b"let a = 1;\n"
+    assert manifest.fingerprinted("missing.js") is None
@@ -1,17 +1,26 @@
 import random
+import threading
+import time
 
 import pytest
 
 from brainstorm.domain import (
+    MAX_EVENTS,
+    MAX_NOTE_LENGTH,
+    MAX_NOTES_PER_PARTICIPANT,
     Board,
+    DeleteNote,
     ForbiddenInPhase,
     InvalidPhaseTransition,
+    MoveNote,
     NameAlreadyExists,
+    NoteDraft,
     NoteTextTooLong,
     NotAuthor,
     NotFound,
     NotOrganizer,
     Phase,
+    SetVote,
     StickyLimitExceeded,
     VoteLimitExceeded,
 )
@@ -160,3 +169,380 @@ def test_missing_entities_raise_not_found():
     board.change_phase("org", Phase.VOTING)
     with pytest.raises(NotFound):
         board.set_vote("org", "missing", 1)
+
+
+def test_version_increments_on_every_mutation():
+    board = Board(rng=random.Random(10))
+    assert board.version == 0
+    board.join("org", True)
+    note = board.add_note("org", "idea", 0, 0)
+    board.move_note(note.id, 1, 1)
+    board.change_phase("org", Phase.VOTING)
+    board.set_vote("org", note.id, 2)
+    board.delete_note(note.id, "org")
+    assert board.version == 6
+    board.reset("org")
+    assert board.version == 7
+
+
+def test_version_unchanged_by_rejected_or_noop_operations():
+    board = Board(rng=random.Random(11))
+    board.join("org", True)
+    version = board.version
+    with pytest.raises(NameAlreadyExists):
+        board.join("org", False)
+    with pytest.raises(NotFound):
+        board.move_note("missing", 0, 0)
+    board.change_phase("org", Phase.GENERATING)
+    assert board.version == version
+
+
+def test_changes_since_returns_events_after_version():
+    board = Board(rng=random.Random(12))
+    board.join("org", True)
+    since = board.version
+    note = board.add_note("org", "idea", 0, 0)
+    board.move_note(note.id, 5, 6)
+    events = board.changes_since(since)
+    assert [event.kind for event in events] == ["note_added", "note_moved"]
+    assert events[0].data["note"] is note
+    assert events[1].data == {"note_id": note.id, "x": 5, "y": 6}
+    assert board.changes_since(board.version) == []
+
+
+def test_changes_since_requires_resync_when_client_is_too_old():
+    board = Board(rng=random.Random(13))
+    board.join("org", True)
+    note = board.add_note("org", "idea", 0, 0)
+    for i in range(MAX_EVENTS):
+        board.move_note(note.id, i, i)
+    assert board.changes_since(0) is None
+    assert board.changes_since(board.version + 1) is None
+    oldest_kept = board.version - MAX_EVENTS
+    assert len(board.changes_since(oldest_kept)) == MAX_EVENTS
+
+
+def test_wait_for_change_wakes_on_mutation_and_times_out():
+    board = Board(rng=random.Random(14))
+    assert board.wait_for_change(board.version, timeout=0.01) is False
+
+    timer = threading.Timer(0.05, board.join, args=("org", True))
+    timer.start()
+    assert board.wait_for_change(0, timeout=5) is True
+    timer.join()
+    assert board.version == 1
+
+
+def _assert_vote_indexes_match_recount(board):
+    votes_by_note = {}
+    for participant_name, allocations in board.votes.items():
+        for note_id, points in allocations.items():
+            votes_by_note.setdefault(note_id, {})[participant_name] = points
+    assert board.votes_by_note == votes_by_note
+    assert board.scores == {
+        note_id: sum(votes_by_note.get(note_id, {}).values()) for note_id in board.notes
+    }
+    assert board.spent_points == {
+        name: sum(allocations.values()) for name, allocations in board.votes.items()
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vote_indexes_match_brute_force_recount(seed):
+    ops = random.Random(seed)
+    board = Board(rng=random.Random(seed))
+    names = ["org", "alice", "bob", "carol"]
+    board.join("org", True)
+    for name in names[1:]:
+        board.join(name, False)
+    for i in range(12):
+        board.add_note(ops.choice(names), f"idea {i}", 0, 0)
+    board.change_phase("org", Phase.VOTING)
+
+    for _ in range(300):
+        note_ids = list(board.notes)
+        if not note_ids:
+            break
+        note_id = ops.choice(note_ids)
+        if ops.random() < 0.1:
+            board.delete_note(note_id, board.notes[note_id].author_name)
+        else:
+            try:
+                board.set_vote(ops.choice(names), note_id, ops.randint(0, 5))
+            except VoteLimitExceeded:
+                pass
+        _assert_vote_indexes_match_recount(board)
+
+    board.reset("org")
+    _assert_vote_indexes_match_recount(board)
+
+
+def test_notes_by_author_tracks_add_delete_and_reset():
+    board = Board(rng=random.Random(15))
+    board.join("org", True)
+    board.join("alice", False)
+    first = board.add_note("alice", "a", 0, 0)
+    second = board.add_note("alice", "b", 0, 0)
+    board.add_note("org", "c", 0, 0)
+    assert board.notes_by_author["alice"] == {first.id, second.id}
+
+    board.delete_note(first.id, "alice")
+    assert board.notes_by_author["alice"] == {second.id}
+
+    board.reset("org")
+    assert board.notes_by_author == {}
+
+
+def test_writers_are_serialized_while_snapshots_do_not_wait():
+    board = Board(rng=random.Random(16))
+    board.join("org", True)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_writer_lock():
+        with board._changed:
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_writer_lock)
+    holder.start()
+    held.wait(5)
+
+    assert [p.name for p in board.snapshot().participants] == ["org"]
+    writer = threading.Thread(target=board.join, args=("alice", False))
+    writer.start()
+    writer.join(0.05)
+    assert writer.is_alive()
+
+    release.set()
+    writer.join(5)
+    holder.join(5)
+    assert "alice" in board.participants
+
+
+def test_snapshot_returns_the_published_state_while_a_write_is_half_done():
+    adding = threading.Event()
+    release = threading.Event()
+
+    class StallingRandom(random.Random):
+        # Stalls the writer in the middle of import_notes, after some notes were added.
+        countdown = None
+
+        def getrandbits(self, k):
+            if self.countdown is not None:
+                self.countdown -= 1
+                if self.countdown == 0:
+                    adding.set()
+                    release.wait(5)
+            return super().getrandbits(k)
+
+    rng = StallingRandom(18)
+    board = Board(rng=rng)
+    board.join("org", True)
+    for index in range(100):
+        board.join(f"p{index}", False)
+    drafts = [NoteDraft(f"p{index % 100}", "idea", index, index) for index in range(5000)]
+    rng.countdown = 2500
+    writer = threading.Thread(target=board.import_notes, args=("org", drafts))
+    writer.start()
+    assert adding.wait(5)
+
+    start = time.perf_counter()
+    before = board.snapshot()
+    viewport = board.snapshot(viewport=(0, 0, 10_000, 10_000))
+    elapsed = time.perf_counter() - start
+    release.set()
+    writer.join(5)
+
+    assert elapsed < 0.5
+    assert before.version == viewport.version == 101
+    assert before.notes == viewport.notes == ()
+    after = board.snapshot()
+    assert after.version == 5101
+    assert len(after.notes) == 5000
+
+
+def test_move_note_replaces_immutable_note():
+    board = Board(rng=random.Random(17))
+    board.join("org", True)
+    note = board.add_note("org", "idea", 1, 2)
+    snapshot = board.snapshot()
+    board.move_note(note.id, 3, 4)
+    assert snapshot.notes == (note,)
+    assert (note.x, note.y) == (1, 2)
+    assert (board.notes[note.id].x, board.notes[note.id].y) == (3, 4)
+
+
+def test_notes_share_author_strings_and_store_numeric_timestamps():
+    board = Board(rng=random.Random(18))
+    participant = board.join("".join(["al", "ice"]), False)
+    first = board.add_note("alice", "a", 0, 0)
+    second = board.add_note("".join(["ali", "ce"]), "b", 0, 0)
+    assert first.author_name is participant.name is second.author_name
+    assert first.color is participant.color
+    assert isinstance(first.created_at, float)
+    assert not hasattr(first, "__dict__")
+
+
+def _voting_board_with_notes(seed):
+    board = Board(rng=random.Random(seed))
+    board.join("org", True)
+    board.join("alice", False)
+    notes = [board.add_note("alice", f"idea {i}", 0, 0) for i in range(3)]
+    board.change_phase("org", Phase.VOTING)
+    return board, notes
+
+
+def test_apply_batch_checks_vote_budget_on_final_allocation():
+    board, (a, b, c) = _voting_board_with_notes(19)
+    board.set_vote("alice", a.id, 5)
+    with pytest.raises(VoteLimitExceeded):
+        board.set_vote("alice", b.id, 3)
+
+    version = board.apply_batch(
+        [
+            SetVote("alice", b.id, 3),
+            SetVote("alice", a.id, 2),
+            MoveNote(c.id, 7, 8),
+        ]
+    )
+    assert version == board.version
+    assert board.votes["alice"] == {a.id: 2, b.id: 3}
+    assert board.spent_points["alice"] == 5
+    assert board.notes[c.id].x == 7
+
+
+def test_apply_batch_is_all_or_nothing():
+    board, (a, b, c) = _voting_board_with_notes(20)
+    board.set_vote("alice", a.id, 4)
+    version = board.version
+
+    with pytest.raises(VoteLimitExceeded):
+        board.apply_batch([MoveNote(c.id, 1, 1), SetVote("alice", b.id, 2)])
+    with pytest.raises(NotFound):
+        board.apply_batch([DeleteNote(b.id, "alice"), SetVote("alice", b.id, 1)])
+    with pytest.raises(NotAuthor):
+        board.apply_batch([MoveNote(c.id, 1, 1), DeleteNote(c.id, "org")])
+    assert board.version == version
+    assert board.notes[c.id].x == 0
+    assert b.id in board.notes
+
+
+def test_import_notes_checks_every_draft_before_adding_any():
+    board = Board(rng=random.Random(4))
+    board.join("org", True)
+    board.join("alice", False)
+    board.join("bob", False)
+    for i in range(MAX_NOTES_PER_PARTICIPANT - 1):
+        board.add_note("alice", f"idea {i}", 0, 0)
+    drafts = [
+        NoteDraft("alice", "last one that fits", 1, 2),
+        NoteDraft("alice", "over the limit", 0, 0),
+        NoteDraft("bob", "x" * (MAX_NOTE_LENGTH + 1), 0, 0),
+        NoteDraft("carol", "not on the board", 0, 0),
+        NoteDraft("bob", "from an earlier session", 3, 4),
+    ]
+    version = board.version
+
+    added, rejected = board.import_notes("org", drafts)
+
+    assert added == 2
+    assert [(index, type(error)) for index, error in rejected] == [
+        (1, StickyLimitExceeded),
+        (2, NoteTextTooLong),
+        (3, NotFound),
+    ]
+    assert "carol" not in board.participants
+    assert board.version == version + 2
+    imported = [note for note in board.notes.values() if note.author_name == "bob"]
+    assert [(note.text, note.x, note.y) for note in imported] == [("from an earlier session", 3, 4)]
+    with pytest.raises(NotOrganizer):
+        board.import_notes("alice", drafts)
+
+
+def test_apply_batch_frees_points_of_deleted_notes():
+    board, (a, b, c) = _voting_board_with_notes(21)
+    board.set_vote("alice", a.id, 5)
+    board.apply_batch([DeleteNote(a.id, "alice"), SetVote("alice", b.id, 5)])
+    assert board.votes["alice"] == {b.id: 5}
+    assert board.scores == {b.id: 5, c.id: 0}
+
+
+def test_drag_positions_are_coalesced_and_not_committed():
+    board = Board(rng=random.Random(22))
+    board.join("org", True)
+    note = board.add_note("org", "idea", 0, 0)
+    version, drag_seq = board.version, board.drag_seq
+
+    board.drag_note(note.id, 1, 1)
+    board.drag_note(note.id, 2, 3)
+    assert board.live_positions() == {note.id: (2, 3)}
+    assert board.drag_seq == drag_seq + 2
+    assert board.version == version
+    assert board.notes[note.id].x == 0
+
+    board.move_note(note.id, 4, 5)
+    assert board.live_positions() == {}
+    assert board.notes[note.id].x == 4
+    with pytest.raises(NotFound):
+        board.drag_note("missing", 0, 0)
+
+
+def test_abandoned_drags_expire(monkeypatch):
+    board = Board(rng=random.Random(23))
+    board.join("org", True)
+    note = board.add_note("org", "idea", 0, 0)
+    board.drag_note(note.id, 1, 1)
+    drag_seq = board.drag_seq
+    monkeypatch.setattr("brainstorm.domain.DRAG_TIMEOUT", -1.0)
+    assert board.live_positions() == {}
+    assert board.drag_positions == {}
+    assert board.drag_seq == drag_seq + 1
+
+
+def test_viewport_snapshot_tracks_moves_and_deletes():
+    board = Board(rng=random.Random(23))
+    board.join("Alice", True)
+    near = board.add_note("Alice", "near", 100, 100)
+    far = board.add_note("Alice", "far", 5000, 5000)
+    gone = board.add_note("Alice", "gone", 200, 200)
+    viewport = (0.0, 0.0, 1000.0, 1000.0)
+
+    assert {note.id for note in board.snapshot(viewport).notes} == {near.id, gone.id}
+
+    board.move_note(far.id, 900, 900)
+    board.move_note(near.id, 1001, 100)
+    board.delete_note(gone.id, "Alice")
+
+    snapshot = board.snapshot(viewport)
+    assert [note.id for note in snapshot.notes] == [far.id]
+    assert set(snapshot.scores) == {far.id}
+
+
+def test_top_matches_a_full_sort_after_votes_and_deletes():
+    rng = random.Random(24)
+    board = Board(rng=random.Random(24))
+    board.join("org", True)
+    voters = [f"voter-{i}" for i in range(12)]
+    for voter in voters:
+        board.join(voter, False)
+    notes = [board.add_note(voters[i % 12], f"idea {i}", 0, 0) for i in range(40)]
+    board.change_phase("org", Phase.VOTING)
+    for _ in range(200):
+        voter = rng.choice(voters)
+        note = rng.choice(notes)
+        if note.id not in board.notes:
+            continue
+        if rng.random() < 0.05:
+            board.delete_note(note.id, note.author_name)
+            continue
+        spent_elsewhere = board.spent_points.get(voter, 0) - board.votes.get(voter, {}).get(
+            note.id, 0
+        )
+        board.set_vote(voter, note.id, rng.randint(0, 5 - spent_elsewhere))
+
+    expected = sorted(board.notes.values(), key=lambda n: (-board.scores[n.id], n.created_at, n.id))
+    assert [(note.id, score) for note, score in board.top(10)] == [
+        (note.id, board.scores[note.id]) for note in expected[:10]
+    ]
+    assert len(board.top(1000)) == len(board.notes)
@@ -0,0 +1,56 @@
+import os
+import random
+
+from brainstorm.domain import Board, Phase
+from brainstorm.persistence import JOURNAL_FILE, Journal, restore_board
+
+
+def _workshop(board: Board) -> None:
+    board.join("org", True)
+    board.join("bob", False)
+    notes = [board.add_note("bob", f"idea {i}", i * 10.0, i * 5.0) for i in range(6)]
+    board.move_note(notes[0].id, 300, 400)
+    board.delete_note(notes[1].id, "bob")
+    board.change_phase("org", Phase.VOTING)
+    board.set_vote("bob", notes[2].id, 3)
+    board.set_vote("org", notes[2].id, 1)
+    board.set_vote("org", notes[3].id, 2)
+    board.set_vote("org", notes[3].id, 4)
+
+
+def test_restore_replays_snapshot_and_journal_tail(tmp_path):
+    board = Board(rng=random.Random(30))
+    journal = Journal(board, str(tmp_path), snapshot_every=5)
+    _workshop(board)
+    assert journal.flush(timeout=5)
+    journal.close()
+
+    restored = restore_board(str(tmp_path))
+    assert restored.snapshot() == board.snapshot()
+    assert restored.spent_points == {"bob": 3, "org": 5}
+    assert restored.notes_by_author == board.notes_by_author
+
+    restored.set_vote("bob", next(iter(restored.notes)), 2)
+    assert restored.version == board.version + 1
+
+
+def test_restore_survives_a_torn_last_line_and_a_reset(tmp_path):
+    board = Board(rng=random.Random(31))
+    journal = Journal(board, str(tmp_path))
+    _workshop(board)
+    board.reset("org")
+    board.join("carol", False)
+    journal.close()
+    with open(os.path.join(tmp_path, JOURNAL_FILE), "a", encoding="utf-8") as file:
+        file.write('{"version": 99, "kind": "note_ad')
+
+    restored = restore_board(str(tmp_path))
+    assert restored.access_code == board.access_code
+    assert list(restored.participants) == ["carol"]
+    assert restored.notes == {} and restored.scores == {}
+    assert restored.version == board.version
+
+
+def test_empty_directory_gives_a_new_board(tmp_path):
+    board = restore_board(str(tmp_path / "missing"))
+    assert board.version == 0 and board.notes == {}
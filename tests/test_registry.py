@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from brainstorm.domain import Board
+from brainstorm.registry import BoardRegistry, TooManyBoards
+
+
+def test_create_registers_boards_under_unique_codes():
+    registry = BoardRegistry()
+    boards = [registry.create(random.Random(i)) for i in range(50)]
+    assert len(registry) == 50
+    for board in boards:
+        assert registry.get(board.access_code) is board
+    assert registry.get("missing") is None
+
+
+def test_rekey_follows_access_code_change():
+    registry = BoardRegistry()
+    board = registry.add(Board(random.Random(0)))
+    board.join("org", True)
+    old_code = board.access_code
+
+    board.reset("org")
+    registry.rekey(old_code, board)
+
+    assert registry.get(old_code) is None
+    assert registry.get(board.access_code) is board
+
+
+def test_create_refuses_past_max_boards():
+    registry = BoardRegistry(max_boards=2)
+    registry.add(Board(random.Random(0)))
+    registry.create(random.Random(1))
+    with pytest.raises(TooManyBoards):
+        registry.create(random.Random(2))
+    assert len(registry) == 2
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from brainstorm.domain import Board, Phase
+from brainstorm.replication import (
+    OwnerUnavailable,
+    ReplicaRegistry,
+    ReplicationServer,
+    wait_for_version,
+)
+
+
+@pytest.fixture
+def owner(tmp_path):
+    board = Board(rng=random.Random(40))
+    board.join("org", True)
+    board.add_note("org", "before", 1, 2)
+    path = str(tmp_path / "owner.sock.replication")
+    server = ReplicationServer(
+        lambda code: board if code in ("", board.access_code) else None, path
+    )
+    server.start()
+    yield board, ReplicaRegistry(path)
+    server.close()
+
+
+def test_replica_follows_the_owner_board(owner):
+    board, replicas = owner
+    replica = replicas.default()
+    assert replica.snapshot() == board.snapshot()
+    assert replicas.get(board.access_code) is replica
+    assert replicas.get("NOPE00") is None
+
+    note = board.add_note("org", "after", 3, 4)
+    board.change_phase("org", Phase.VOTING)
+    board.set_vote("org", note.id, 4)
+    assert wait_for_version(replica, board.version)
+    assert replica.snapshot() == board.snapshot()
+    assert replica.spent_points == {"org": 4}
+
+    board.drag_note(note.id, 50, 60)
+    assert replica.wait_for_change(replica.version, 5, replica.drag_seq)
+    assert replica.live_positions() == {note.id: (50, 60)}
+
+
+def test_replica_is_rekeyed_when_the_owner_resets(owner):
+    board, replicas = owner
+    replica = replicas.get(board.access_code)
+    old_code = board.access_code
+    board.reset("org")
+    assert wait_for_version(replica, board.version)
+    assert replica.access_code == board.access_code != old_code
+    assert replicas.get(board.access_code) is replica
+    assert replica.notes == {}
+
+
+def test_unknown_codes_are_remembered_and_a_missing_owner_is_reported(owner, tmp_path):
+    board, replicas = owner
+    lookups = []
+    subscribe = replicas._subscribe
+
+    def counting_subscribe(code):
+        lookups.append(code)
+        return subscribe(code)
+
+    replicas._subscribe = counting_subscribe
+    assert replicas.get("NOPE00") is None
+    assert replicas.get("NOPE00") is None
+    assert lookups == ["NOPE00"]
+
+    with pytest.raises(OwnerUnavailable):
+        ReplicaRegistry(str(tmp_path / "missing.sock")).get(board.access_code)
+
+
+def test_replica_updates_are_not_reported_as_operations(owner, monkeypatch):
+    board, replicas = owner
+    observed = []
+    monkeypatch.setattr(Board, "operation_observer", lambda name, *_: observed.append(name))
+    replica = replicas.default()
+    board.add_note("org", "after", 3, 4)
+    assert wait_for_version(replica, board.version)
+    assert observed == ["add_note"]
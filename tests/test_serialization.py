@@ -0,0 +1,101 @@
+import gzip
+import json
+import random
+
+from brainstorm.domain import Board, Phase
+from brainstorm.serialization import (
+    BoardStateCache,
+    export_lines,
+    note_to_dict,
+    participant_to_dict,
+)
+
+
+def _board_with_notes():
+    board = Board(rng=random.Random(0))
+    board.join("org", True)
+    board.join("alice", False)
+    first = board.add_note("org", "one", 1, 2)
+    second = board.add_note("alice", "two", 3, 4)
+    return board, first, second
+
+
+def test_encoded_body_matches_board_state():
+    board, first, second = _board_with_notes()
+    board.change_phase("org", Phase.VOTING)
+    board.set_vote("alice", first.id, 3)
+
+    version, body = BoardStateCache().encode(board)
+    assert version == board.version
+    assert json.loads(body) == {
+        "version": board.version,
+        "phase": "VOTING",
+        "participants": [participant_to_dict(p) for p in board.participants.values()],
+        "stickies": [note_to_dict(first), note_to_dict(second)],
+        "votes": {first.id: {"alice": 3}},
+        "scores": {first.id: 3, second.id: 0},
+        "spent": {"alice": 3},
+    }
+
+
+def test_cache_reuses_body_and_unchanged_note_fragments():
+    board, first, second = _board_with_notes()
+    cache = BoardStateCache()
+    _, body = cache.encode(board)
+    assert cache.encode(board)[1] is body
+    first_fragment = cache._notes[first.id][1]
+    second_fragment = cache._notes[second.id][1]
+
+    board.move_note(second.id, 9, 9)
+    _, moved_body = cache.encode(board)
+    assert moved_body is not body
+    assert cache._notes[first.id][1] is first_fragment
+    assert cache._notes[second.id][1] is not second_fragment
+    assert json.loads(moved_body)["stickies"][1]["x"] == 9
+
+    board.delete_note(first.id, "org")
+    cache.encode(board)
+    assert first.id not in cache._notes
+
+
+def test_viewport_body_contains_only_visible_notes():
+    board, first, second = _board_with_notes()
+    board.change_phase("org", Phase.VOTING)
+    board.set_vote("alice", second.id, 2)
+    cache = BoardStateCache()
+
+    _, body = cache.encode(board, viewport=(2, 2, 10, 10))
+    data = json.loads(body)
+    assert [sticky["id"] for sticky in data["stickies"]] == [second.id]
+    assert data["votes"] == {second.id: {"alice": 2}}
+    assert data["scores"] == {second.id: 2}
+    assert data["spent"] == {"alice": 2}
+    assert len(data["participants"]) == 2
+
+
+def test_compressed_body_is_cached_per_version_and_skipped_when_small():
+    board, first, _ = _board_with_notes()
+    cache = BoardStateCache()
+    assert cache.encode_as(board, "gzip")[1:] == (None, cache.encode(board)[1])
+
+    for i in range(30):
+        board.add_note("alice", f"idea number {i}", i, i)
+    version, encoding, body = cache.encode_as(board, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == cache.encode(board)[1]
+    assert cache.encode_as(board, "gzip")[2] is body
+
+    board.move_note(first.id, 5, 5)
+    assert cache.encode_as(board, "gzip")[2] is not body
+
+
+def test_csv_export_defuses_spreadsheet_formulas():
+    board = Board(rng=random.Random(9))
+    board.join("=org", True)
+    board.add_note("=org", "=HYPERLINK(\"http://evil\")", -5, 0)
+    board.add_note("=org", "plain - text", 1, 2)
+
+    rows = "".join(export_lines(board.scored_notes(), "csv")).splitlines()
+    assert rows[1].split(",")[1:3] == ['"\'=HYPERLINK(""http://evil"")"', "'=org"]
+    assert rows[1].split(",")[4] == "-5"
+    assert rows[2].split(",")[1] == "plain - text"
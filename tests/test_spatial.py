@@ -0,0 +1,45 @@
+import random
+
+from brainstorm.spatial import GridIndex
+
+
+def _brute_force(points, x0, y0, x1, y1):
+    return {key for key, (x, y) in points.items() if x0 <= x <= x1 and y0 <= y <= y1}
+
+
+def test_grid_query_matches_brute_force_after_moves_and_removals():
+    rng = random.Random(0)
+    index = GridIndex(cell_size=100)
+    points = {}
+    for i in range(500):
+        key = f"n{i}"
+        points[key] = (rng.uniform(-1000, 3000), rng.uniform(-1000, 3000))
+        index.insert(key, *points[key])
+    for key in rng.sample(sorted(points), 100):
+        points[key] = (rng.uniform(-1000, 3000), rng.uniform(-1000, 3000))
+        index.move(key, *points[key])
+    for key in rng.sample(sorted(points), 50):
+        del points[key]
+        index.remove(key)
+
+    assert len(index) == len(points)
+    for _ in range(50):
+        x0, y0 = rng.uniform(-1200, 3000), rng.uniform(-1200, 3000)
+        x1, y1 = x0 + rng.uniform(0, 5000), y0 + rng.uniform(0, 800)
+        candidates = set(index.query(x0, y0, x1, y1))
+        assert _brute_force(points, x0, y0, x1, y1) <= candidates
+
+
+def test_snapshot_is_unaffected_by_later_changes():
+    index = GridIndex(cell_size=100)
+    index.insert("a", 10, 10)
+    index.insert("b", 150, 10)
+    snapshot = index.snapshot()
+    index.move("a", 160, 10)
+    index.remove("b")
+    index.insert("c", 20, 20)
+
+    assert set(snapshot.query(0, 0, 300, 100)) == {"a", "b"}
+    assert set(snapshot.query(0, 0, 99, 99)) == {"a"}
+    assert set(index.snapshot().query(0, 0, 300, 100)) == {"a", "c"}
+    assert set(index.snapshot().query(0, 0, 99, 99)) == {"c"}
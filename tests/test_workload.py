@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from brainstorm.domain import Board, MoveNote, NoteDraft, NotFound, Phase, SetVote
+from brainstorm.workload import WorkloadRecorder, load, replay, state_hash
+
+
+def _session(board: Board) -> None:
+    board.join("org", True)
+    board.join(name="bob", is_organizer=False)
+    board.import_notes(requester="org", drafts=[NoteDraft("carol", "seeded", 1, 2)])
+    notes = [board.add_note("bob", f"idea {i}", i * 10.0, i * 5.0) for i in range(4)]
+    board.drag_note(notes[0].id, 50, 50)
+    board.move_note(notes[0].id, 60, 60)
+    board.snapshot((0, 0, 100, 100))
+    with pytest.raises(NotFound):
+        board.delete_note("missing", "bob")
+    board.change_phase("org", new_phase=Phase.VOTING)
+    board.apply_batch([SetVote("bob", notes[1].id, 3), MoveNote(notes[2].id, 7, 7)])
+    board.changes_since(0)
+    board.top(3)
+
+
+def test_replay_reproduces_the_recorded_session(tmp_path):
+    board = Board(rng=random.Random(5))
+    board.join("early", False)  # before recording: restored from the header
+    path = str(tmp_path / "session.jsonl.gz")
+    recorder = WorkloadRecorder(board, path)
+    _session(board)
+    board.reset("org")  # draws a new access code from the RNG
+    recorder.close()
+    assert board.call_recorder is None
+
+    recording = load(path)
+    assert [call[1] for call in recording.calls][:3] == ["join", "join", "import_notes"]
+    assert "restore" not in {call[1] for call in recording.calls}
+    report = replay(recording)
+    assert report.mismatches == 0
+    assert report.verified
+    assert report.state_hash == state_hash(board.snapshot())
+    assert recording.board.access_code == board.access_code
+    assert report.summary()["add_note"]["count"] == 4
+